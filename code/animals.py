@@ -1,10 +1,34 @@
 import pygame
 import random
 import os
+import numpy as np
 from .sprite_sheet import SpriteSheet
+from .assets import asset_cache
+from .blitting import render_blits
+from .atlas import atlas
+from .herd import Herd, DIRECTIONS, DIRECTION_CODES
+from .settings import BATCHED_ANIMALS
+
+
+# Grid cell size (pixels) of the index used to cull individual animals; larger than
+# an animal plus the distance it moves in one tick
+ANIMAL_CELL_SIZE = 128
+
+# Sprite sheet and frame count for each (animal type, baby) pair
+ANIMAL_SHEETS = {
+    ("chicken", False): ("assets/images/animals/PixelFarm_Chicken-Sheet.png", 7),
+    ("chicken", True): ("assets/images/animals/PixelFarm_BabyChicken-Sheet.png", 7),
+    ("cow", False): ("assets/images/animals/PixelFarm_Cow-Sheet.png", 6),
+    ("cow", True): ("assets/images/animals/PixelFarm_BabyCow-Sheet.png", 6),
+    ("sheep", False): ("assets/images/animals/PixelFarm_Sheep-Sheet.png", 6),
+    ("sheep", True): ("assets/images/animals/PixelFarm_BabySheep-Sheet.png", 6),
+}
 
 
 class Animal:
+    # Animation tables per (animal type, baby, pixel scale), built once and shared by every animal
+    animation_tables = {}
+
     def __init__(self, game, x, y, animal_type, is_baby=False):
         self.game = game
         self.x = x
@@ -20,8 +44,12 @@ class Animal:
             self.width = 32
             self.height = 32
 
+        # Position at the previous tick, for interpolated rendering
+        self.prev_x = x
+        self.prev_y = y
+
         # Movement
-        self.speed = 1 if not is_baby else 0.7
+        self.speed = 60 if not is_baby else 42  # Pixels per second
         self.direction = random.choice(["down", "up", "left", "right"])
         self.moving = False
         self.move_timer = 0
@@ -30,12 +58,12 @@ class Animal:
 
         # Animation
         self.frame = 0
-        self.animation_speed = 0.1
+        self.animation_speed = 6  # Frames per second
         self.animation_timer = 0
 
         # Growth (for baby animals)
         self.age = 0
-        self.growth_rate = 0.001  # How fast the animal grows
+        self.growth_rate = 0.06  # Growth per second (adult after about 17 seconds)
 
         # Debug
         self.debug = True
@@ -43,57 +71,67 @@ class Animal:
         # Load sprites
         self.load_sprites()
 
-    def _create_colored_rect(self, color):
+    @staticmethod
+    def _create_colored_rect(color, size):
         # Helper method to create a colored rectangle with a border
-        surf = pygame.Surface((self.width, self.height), pygame.SRCALPHA)
-        pygame.draw.rect(surf, color, (0, 0, self.width, self.height))
-        pygame.draw.rect(surf, (0, 0, 0), (0, 0, self.width, self.height), 2)  # Black border
+        surf = pygame.Surface((size, size), pygame.SRCALPHA)
+        pygame.draw.rect(surf, color, (0, 0, size, size))
+        pygame.draw.rect(surf, (0, 0, 0), (0, 0, size, size), 2 if size > 16 else 1)  # Black border
         return surf
 
-    def _get_animal_color(self):
+    @staticmethod
+    def _get_animal_color(animal_type, is_baby):
         # Helper method to get color based on animal type
-        if self.animal_type == "chicken":
-            return (255, 255, 150) if not self.is_baby else (255, 255, 0)
-        elif self.animal_type == "cow":
-            return (200, 200, 200) if not self.is_baby else (255, 200, 200)
-        elif self.animal_type == "sheep":
-            return (240, 240, 240) if not self.is_baby else (255, 240, 240)
+        if animal_type == "chicken":
+            return (255, 255, 150) if not is_baby else (255, 255, 0)
+        elif animal_type == "cow":
+            return (200, 200, 200) if not is_baby else (255, 200, 200)
+        elif animal_type == "sheep":
+            return (240, 240, 240) if not is_baby else (255, 240, 240)
         return (255, 255, 255)  # Default white
 
+    @classmethod
+    def get_animations(cls, animal_type, is_baby, scale=1):
+        """Return the animation table shared by every animal of this type and age.
+
+        Frames are 1 / scale of the animal's size in world pixels (the art's own
+        size at native resolution).
+        """
+        key = (animal_type, is_baby, scale)
+        animations = cls.animation_tables.get(key)
+        if animations is None:
+            name = f"animals/{animal_type}" + ("_baby" if is_baby else "") + f"/{scale}"
+            animations = atlas.pack(name, cls.build_animations(animal_type, is_baby, scale))
+            cls.animation_tables[key] = animations
+        return animations
+
+    @classmethod
+    def prepare_animations(cls, scale=1):
+        # Build the baby and adult tables of every species up front, so growing up
+        # in the middle of a tick never touches the disk
+        for animal_type, is_baby in ANIMAL_SHEETS:
+            cls.get_animations(animal_type, is_baby, scale)
+
     def load_sprites(self):
+        self.animations = Animal.get_animations(self.animal_type, self.is_baby, self.game.pixel_scale)
+
+    @classmethod
+    def build_animations(cls, animal_type, is_baby, scale=1):
+        size = (24 if is_baby else 32) // scale
+        color = cls._get_animal_color(animal_type, is_baby)
         try:
             # Make sure the directory exists
             os.makedirs("assets/images/animals", exist_ok=True)
 
             # Create fallback sprite first
-            fallback_sprite = self._create_colored_rect(self._get_animal_color())
+            fallback_sprite = cls._create_colored_rect(color, size)
 
             # Try to load the appropriate sprite sheet
             try:
                 # Determine which sprite sheet to load based on animal type and age
-                if self.animal_type == "chicken":
-                    if self.is_baby:
-                        sheet_path = "assets/images/animals/PixelFarm_BabyChicken-Sheet.png"
-                        frame_count = 7  # Number of frames in the baby chicken sheet
-                    else:
-                        sheet_path = "assets/images/animals/PixelFarm_Chicken-Sheet.png"
-                        frame_count = 7  # Number of frames in the chicken sheet
-                elif self.animal_type == "cow":
-                    if self.is_baby:
-                        sheet_path = "assets/images/animals/PixelFarm_BabyCow-Sheet.png"
-                        frame_count = 6  # Number of frames in the baby cow sheet
-                    else:
-                        sheet_path = "assets/images/animals/PixelFarm_Cow-Sheet.png"
-                        frame_count = 6  # Number of frames in the cow sheet
-                elif self.animal_type == "sheep":
-                    if self.is_baby:
-                        sheet_path = "assets/images/animals/PixelFarm_BabySheep-Sheet.png"
-                        frame_count = 6  # Number of frames in the baby sheep sheet
-                    else:
-                        sheet_path = "assets/images/animals/PixelFarm_Sheep-Sheet.png"
-                        frame_count = 6  # Number of frames in the sheep sheet
-                else:
-                    raise ValueError(f"Unknown animal type: {self.animal_type}")
+                if (animal_type, is_baby) not in ANIMAL_SHEETS:
+                    raise ValueError(f"Unknown animal type: {animal_type}")
+                sheet_path, frame_count = ANIMAL_SHEETS[(animal_type, is_baby)]
 
                 # Load the sprite sheet
                 sheet = SpriteSheet(sheet_path)
@@ -102,14 +140,12 @@ class Animal:
                 frame_width = 16
                 frame_height = 16
 
-                # Load all frames from the sheet
-                frames = sheet.load_strip((0, 0, frame_width, frame_height), frame_count)
-
-                # Scale frames to the appropriate size
-                scaled_frames = [pygame.transform.scale(frame, (self.width, self.height)) for frame in frames]
+                # Load all frames from the sheet, scaled to the appropriate size
+                scaled_frames = sheet.load_strip((0, 0, frame_width, frame_height), frame_count,
+                                                 size=(size, size))
 
                 # Organize frames into animations
-                self.animations = {
+                animations = {
                     "down": scaled_frames[:2],
                     "up": scaled_frames[2:4] if len(scaled_frames) > 3 else scaled_frames[:2],
                     "left": scaled_frames[4:6] if len(scaled_frames) > 5 else scaled_frames[:2],
@@ -117,12 +153,13 @@ class Animal:
                     "idle": [scaled_frames[0]]  # Use first frame for idle
                 }
 
-                print(f"Loaded sprites for {self.animal_type} (baby: {self.is_baby})")
+                print(f"Loaded sprites for {animal_type} (baby: {is_baby})")
+                return animations
 
             except Exception as e:
                 print(f"Error loading animal sprites: {e}")
                 # Use fallback sprites
-                self.animations = {
+                return {
                     "down": [fallback_sprite, fallback_sprite],
                     "up": [fallback_sprite, fallback_sprite],
                     "left": [fallback_sprite, fallback_sprite],
@@ -133,28 +170,33 @@ class Animal:
         except Exception as e:
             print(f"Critical error in animal load_sprites: {e}")
             # Last resort fallback
-            color = self._get_animal_color()
-            self.animations = {
-                "down": [self._create_colored_rect(color) for _ in range(2)],
-                "up": [self._create_colored_rect(color) for _ in range(2)],
-                "left": [self._create_colored_rect(color) for _ in range(2)],
-                "right": [self._create_colored_rect(color) for _ in range(2)],
-                "idle": [self._create_colored_rect(color)]
+            return {
+                "down": [cls._create_colored_rect(color, size) for _ in range(2)],
+                "up": [cls._create_colored_rect(color, size) for _ in range(2)],
+                "left": [cls._create_colored_rect(color, size) for _ in range(2)],
+                "right": [cls._create_colored_rect(color, size) for _ in range(2)],
+                "idle": [cls._create_colored_rect(color, size)]
             }
 
-    def update(self):
+    def grow_up(self):
+        self.is_baby = False
+        self.width = 32
+        self.height = 32
+        self.speed = 60
+        self.load_sprites()  # Switch to the shared adult animations
+
+    def update(self, dt):
+        self.prev_x = self.x
+        self.prev_y = self.y
+
         # Handle growth for baby animals
         if self.is_baby:
-            self.age += self.growth_rate
+            self.age += self.growth_rate * dt
             if self.age >= 1.0:
-                self.is_baby = False
-                self.width = 32
-                self.height = 32
-                self.speed = 1
-                self.load_sprites()  # Reload sprites with adult size
+                self.grow_up()
 
         # Handle movement
-        self.move_timer += 1 / 60  # Assuming 60 FPS
+        self.move_timer += dt
 
         if self.moving:
             if self.move_timer >= self.move_duration:
@@ -163,18 +205,20 @@ class Animal:
                 self.move_cooldown = random.uniform(1.0, 3.0)
             else:
                 # Move in the current direction
+                step = self.speed * dt
                 if self.direction == "left":
-                    self.x -= self.speed
+                    self.x -= step
                 elif self.direction == "right":
-                    self.x += self.speed
+                    self.x += step
                 elif self.direction == "up":
-                    self.y -= self.speed
+                    self.y -= step
                 elif self.direction == "down":
-                    self.y += self.speed
+                    self.y += step
 
-                # Keep animal on screen
-                self.x = max(0, min(self.game.WIDTH - self.width, self.x))
-                self.y = max(0, min(self.game.HEIGHT - self.height, self.y))
+                # Keep animal inside the world
+                world = self.game.world
+                self.x = max(0, min(world.width - self.width, self.x))
+                self.y = max(0, min(world.height - self.height, self.y))
         else:
             if self.move_timer >= self.move_cooldown:
                 self.moving = True
@@ -183,13 +227,27 @@ class Animal:
                 self.direction = random.choice(["down", "up", "left", "right"])
 
         # Update animation
-        self.animation_timer += self.animation_speed
+        self.animation_timer += self.animation_speed * dt
         if self.animation_timer >= 1:
             self.animation_timer = 0
             animation_key = self.direction if self.moving else "idle"
             self.frame = (self.frame + 1) % len(self.animations[animation_key])
 
-    def render(self, screen):
+    def render_pos(self):
+        # Position between the last two ticks, matching the time being rendered
+        alpha = self.game.alpha
+        return (self.prev_x + (self.x - self.prev_x) * alpha,
+                self.prev_y + (self.y - self.prev_y) * alpha)
+
+
+    def get_rect(self):
+        # Positions are fractional, so pad by a pixel to cover rounding when blitting
+        return pygame.Rect(self.render_pos(), (self.width + 1, self.height + 1))
+
+    def get_render_state(self):
+        return self.render_pos(), self.direction, self.moving, self.frame, self.is_baby
+
+    def add_blits(self, draw_list, offset=(0, 0), scale=1):
         # Determine which animation to use
         animation_key = self.direction if self.moving else "idle"
 
@@ -197,19 +255,100 @@ class Animal:
         frame_index = min(self.frame, len(self.animations[animation_key]) - 1)
         current_frame = self.animations[animation_key][frame_index]
 
-        # Draw animal
-        screen.blit(current_frame, (self.x, self.y))
+        # Animal: whole world pixels, shifted by the camera position (offset), in view
+        # pixels of scale world pixels
+        x, y = self.render_pos()
+        pos = ((int(x) - offset[0]) // scale, (int(y) - offset[1]) // scale)
+        draw_list.append((current_frame, pos))
 
-        # Debug outline
+        # Debug outline (pre-drawn, shared by every animal of this size)
         if self.debug:
-            pygame.draw.rect(screen, (0, 255, 0), (self.x, self.y, self.width, self.height), 1)
+            draw_list.append((asset_cache.outline((self.width // scale, self.height // scale), (0, 255, 0)), pos))
+
+    def render(self, screen, offset=(0, 0)):
+        render_blits(self, screen, offset)
+
+
+def _herd_column(name, convert):
+    # Property reading and writing one column of the animal's herd row
+    def getter(self):
+        return convert(getattr(self.herd, name)[self.index])
+
+    def setter(self, value):
+        getattr(self.herd, name)[self.index] = value
+
+    return property(getter, setter)
+
+
+class HerdAnimal(Animal):
+    """An Animal whose wandering state lives in a row of a Herd.
+
+    The herd moves all its animals in one vectorized step; this object only
+    exposes the row under the usual attribute names for rendering.
+    """
+
+    x = _herd_column("x", float)
+    y = _herd_column("y", float)
+    prev_x = _herd_column("prev_x", float)
+    prev_y = _herd_column("prev_y", float)
+    width = _herd_column("width", int)
+    height = _herd_column("height", int)
+    speed = _herd_column("speed", float)
+    moving = _herd_column("moving", bool)
+    move_timer = _herd_column("move_timer", float)
+    move_cooldown = _herd_column("move_cooldown", float)
+    move_duration = _herd_column("move_duration", float)
+    frame = _herd_column("frame", int)
+    animation_timer = _herd_column("animation_timer", float)
+    is_baby = _herd_column("is_baby", bool)
+    age = _herd_column("age", float)
+
+    @property
+    def direction(self):
+        return DIRECTIONS[self.herd.direction[self.index]]
+
+    @direction.setter
+    def direction(self, value):
+        self.herd.direction[self.index] = DIRECTION_CODES[value]
+
+    def __init__(self, herd, game, x, y, animal_type, is_baby=False):
+        # The row must exist before Animal.__init__ assigns the attributes
+        self.herd = herd
+        self.index = herd.add(self)
+        super().__init__(game, x, y, animal_type, is_baby)
+
+    def load_sprites(self):
+        super().load_sprites()
+        self.herd.move_frames[self.index] = len(self.animations["down"])
+
+    def update(self, dt):
+        # The herd updates all its animals at once
+        pass
 
 
 class AnimalManager:
-    def __init__(self, game):
+    def __init__(self, game, render_queue, batched=None, bounds=None):
         self.game = game
         self.animals = []
 
+        # Size of the area the animals wander in (the world; one screen by default)
+        self.bounds = bounds or (game.WIDTH, game.HEIGHT)
+
+        # Draw order shared with the other entities of the world
+        self.render_queue = render_queue
+
+        # In batched mode the animals' state is kept in arrays and updated in one step
+        self.batched = BATCHED_ANIMALS if batched is None else batched
+        self.herd = Herd(self.bounds) if self.batched else None
+
+        # Individual animals are filed by the grid cell of their position, so culling
+        # only looks at the cells in view (the herd is tested as arrays instead)
+        self.cells = {}  # (cx, cy) -> {animal: None}
+        self.animal_cells = {}  # animal -> (cx, cy)
+
+        # Baby and adult animations of every species, ready before any animal grows up
+        Animal.prepare_animations(game.pixel_scale)
+
         # Spawn some initial animals
         self.spawn_initial_animals()
 
@@ -218,46 +357,124 @@ class AnimalManager:
         for _ in range(3):
             x = random.randint(100, self.game.WIDTH - 100)
             y = random.randint(100, self.game.HEIGHT - 100)
-            self.animals.append(Animal(self.game, x, y, "chicken", is_baby=False))
+            self.add_animal(x, y, "chicken", is_baby=False)
 
         # Spawn some baby chickens
         for _ in range(2):
             x = random.randint(100, self.game.WIDTH - 100)
             y = random.randint(100, self.game.HEIGHT - 100)
-            self.animals.append(Animal(self.game, x, y, "chicken", is_baby=True))
+            self.add_animal(x, y, "chicken", is_baby=True)
 
         # Spawn some cows
         for _ in range(2):
             x = random.randint(100, self.game.WIDTH - 100)
             y = random.randint(100, self.game.HEIGHT - 100)
-            self.animals.append(Animal(self.game, x, y, "cow", is_baby=False))
+            self.add_animal(x, y, "cow", is_baby=False)
 
         # Spawn some baby cows
         for _ in range(1):
             x = random.randint(100, self.game.WIDTH - 100)
             y = random.randint(100, self.game.HEIGHT - 100)
-            self.animals.append(Animal(self.game, x, y, "cow", is_baby=True))
+            self.add_animal(x, y, "cow", is_baby=True)
 
         # Spawn some sheep
         for _ in range(2):
             x = random.randint(100, self.game.WIDTH - 100)
             y = random.randint(100, self.game.HEIGHT - 100)
-            self.animals.append(Animal(self.game, x, y, "sheep", is_baby=False))
+            self.add_animal(x, y, "sheep", is_baby=False)
 
         # Spawn some baby sheep
         for _ in range(1):
             x = random.randint(100, self.game.WIDTH - 100)
             y = random.randint(100, self.game.HEIGHT - 100)
-            self.animals.append(Animal(self.game, x, y, "sheep", is_baby=True))
-
-    def update(self):
-        for animal in self.animals:
-            animal.update()
+            self.add_animal(x, y, "sheep", is_baby=True)
 
-    def render(self, screen):
-        # Sort animals by y-coordinate for proper depth
-        sorted_animals = sorted(self.animals, key=lambda animal: animal.y)
+    def add_animal(self, x, y, animal_type, is_baby=False):
+        if self.batched:
+            animal = HerdAnimal(self.herd, self.game, x, y, animal_type, is_baby)
+        else:
+            animal = Animal(self.game, x, y, animal_type, is_baby)
+            self.file_animal(animal)
+        self.animals.append(animal)
+        self.render_queue.add(animal)
+        return animal
 
-        for animal in sorted_animals:
-            animal.render(screen)
+    def clear(self):
+        for animal in self.animals:
+            self.render_queue.remove(animal)
+        self.animals = []
+        self.cells = {}
+        self.animal_cells = {}
+        if self.batched:
+            self.herd = Herd(self.bounds)
+
+    def file_animal(self, animal, cell=None):
+        # Move the animal to the cell of its position; called when that cell changed
+        if cell is None:
+            cell = (int(animal.x) // ANIMAL_CELL_SIZE, int(animal.y) // ANIMAL_CELL_SIZE)
+        old_cell = self.animal_cells.get(animal)
+        if old_cell is not None:
+            members = self.cells[old_cell]
+            del members[animal]
+            if not members:
+                del self.cells[old_cell]
+        self.animal_cells[animal] = cell
+        self.cells.setdefault(cell, {})[animal] = None
+
+    def animals_in_rect(self, rect):
+        """Animals whose drawn area overlaps rect (e.g. the viewport)."""
+        if not self.batched:
+            # Animals are filed by their top-left corner and are drawn less than a
+            # cell to the right and below it (size plus one tick of movement), so
+            # the cells in view plus one more column and row before them cover all
+            size = ANIMAL_CELL_SIZE
+            cells = self.cells
+            found = []
+            for cx in range(rect.left // size - 1, (rect.right - 1) // size + 1):
+                for cy in range(rect.top // size - 1, (rect.bottom - 1) // size + 1):
+                    members = cells.get((cx, cy))
+                    if members:
+                        found.extend(animal for animal in members if rect.colliderect(animal.get_rect()))
+            return found
+
+        # Test the whole herd at once, against the span between the last two tick
+        # positions so the interpolated position is covered too
+        herd = self.herd
+        n = herd.count
+        x, prev_x = herd.x[:n], herd.prev_x[:n]
+        y, prev_y = herd.y[:n], herd.prev_y[:n]
+        inside = ((np.maximum(x, prev_x) + herd.width[:n] + 1 > rect.left) &
+                  (np.minimum(x, prev_x) < rect.right) &
+                  (np.maximum(y, prev_y) + herd.height[:n] + 1 > rect.top) &
+                  (np.minimum(y, prev_y) < rect.bottom))
+        views = herd.views
+        return [views[index] for index in np.flatnonzero(inside).tolist()]
+
+    def update(self, dt):
+        if self.batched:
+            self.herd.step(dt)
+            self.update_herd_depths()
+            return
+
+        # Re-file only the animals whose bottom edge crossed a pixel row
+        render_queue = self.render_queue
+        depths = render_queue.depths
+        animal_cells = self.animal_cells
+        for animal in self.animals:
+            animal.update(dt)
+            cell = (int(animal.x) // ANIMAL_CELL_SIZE, int(animal.y) // ANIMAL_CELL_SIZE)
+            if animal_cells[animal] != cell:
+                self.file_animal(animal, cell)
+            depth = int(animal.y + animal.height)
+            if depths[animal] != depth:
+                render_queue.update(animal, depth)
+
+    def update_herd_depths(self):
+        # Only animals whose bottom edge crossed a pixel row move in the draw order
+        herd = self.herd
+        n = herd.count
+        depths = (herd.y[:n] + herd.height[:n]).astype(np.int64)
+        for index in np.flatnonzero(depths != herd.depth[:n]).tolist():
+            self.render_queue.update(herd.views[index], int(depths[index]))
+        herd.depth[:n] = depths
 
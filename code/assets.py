@@ -0,0 +1,180 @@
+import pygame
+from collections import OrderedDict
+from .settings import ASSET_CACHE_MAX_BYTES
+
+
+class AssetCache:
+    """Process-wide LRU cache of decoded images and scaled frames.
+
+    Entries are keyed by (file, rect, target size, colorkey) so identical frames
+    are decoded and scaled only once, no matter how many entities use them.
+    Cached surfaces are shared and must be treated as read-only by callers.
+    With baked assets attached (see code/bake.py), a miss on a baked frame is
+    served from the bake's raw pixels instead of decoding and scaling the PNG.
+    """
+
+    def __init__(self, max_bytes=ASSET_CACHE_MAX_BYTES):
+        self.max_bytes = max_bytes
+        self.entries = OrderedDict()
+        self.entry_bytes = {}
+        self.total_bytes = 0
+
+        # Pre-scaled frames from the asset bake, if one is attached
+        self.baked = None
+
+        # Statistics
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.baked_hits = 0
+
+    @staticmethod
+    def make_key(filename, rect=None, size=None, colorkey=None):
+        if rect is not None:
+            rect = tuple(pygame.Rect(rect))
+        if size is not None:
+            size = tuple(size)
+        if colorkey is not None and colorkey != -1:
+            colorkey = tuple(pygame.Color(colorkey))
+        return filename, rect, size, colorkey
+
+    @staticmethod
+    def surface_bytes(value, seen=None):
+        # Count the pixel memory of a surface or of nested lists/dicts of surfaces,
+        # counting surfaces shared between animations only once
+        if seen is None:
+            seen = set()
+        if isinstance(value, pygame.Surface):
+            if id(value) in seen:
+                return 0
+            seen.add(id(value))
+            return value.get_width() * value.get_height() * value.get_bytesize()
+        if isinstance(value, dict):
+            value = list(value.values())
+        if isinstance(value, (list, tuple)):
+            return sum(AssetCache.surface_bytes(item, seen) for item in value)
+        return 0
+
+    def lookup(self, key):
+        """Return the cached (or baked) value for key, or None."""
+        value = self.entries.get(key)
+        if value is not None:
+            self.entries.move_to_end(key)
+            self.hits += 1
+            return value
+
+        if self.baked is not None:
+            value = self.baked.load(key)
+            if value is not None:
+                self.baked_hits += 1
+                self.put(key, value)
+        return value
+
+    def get(self, key, factory):
+        """Return the cached value for key, building it with factory on a miss."""
+        value = self.lookup(key)
+        if value is not None:
+            return value
+
+        self.misses += 1
+        value = factory()
+        self.put(key, value)
+        return value
+
+    def put(self, key, value):
+        if key in self.entries:
+            self.total_bytes -= self.entry_bytes.pop(key)
+            del self.entries[key]
+
+        size = self.surface_bytes(value)
+        self.entries[key] = value
+        self.entry_bytes[key] = size
+        self.total_bytes += size
+
+        # Evict the least recently used entries, but always keep the newest one
+        while self.total_bytes > self.max_bytes and len(self.entries) > 1:
+            old_key, _ = self.entries.popitem(last=False)
+            self.total_bytes -= self.entry_bytes.pop(old_key)
+            self.evictions += 1
+
+    def load_image(self, filename):
+        """Decode an image file once and keep it converted for the display."""
+
+        def load():
+            image = pygame.image.load(filename).convert_alpha()
+            print(f"Loaded image: {filename}")
+            return image
+
+        return self.get(self.make_key(filename), load)
+
+    def add_image(self, filename, image):
+        """Cache an image decoded elsewhere (e.g. on a preloading thread) as load_image would."""
+        self.put(self.make_key(filename), image.convert_alpha())
+
+    def frame(self, filename, rect=None, size=None, colorkey=None):
+        """Return a (possibly cropped and scaled) frame of an image file."""
+        key = self.make_key(filename, rect, size, colorkey)
+        return self.get(key, lambda: self.cut_frame(self.load_image(filename), rect, size, colorkey))
+
+    def solid(self, size, color):
+        """A shared rectangle of one colour, e.g. an indicator or a progress bar."""
+
+        def build():
+            surface = pygame.Surface(size)
+            surface.fill(color)
+            return surface
+
+        return self.get(("solid", None, tuple(size), tuple(color)), build)
+
+    def outline(self, size, color):
+        """A shared transparent surface with a one pixel border (debug outlines)."""
+
+        def build():
+            surface = pygame.Surface(size, pygame.SRCALPHA)
+            width, height = size
+            pygame.draw.lines(surface, color, True, [(0, 0), (width - 1, 0),
+                                                     (width - 1, height - 1), (0, height - 1)])
+            return surface
+
+        return self.get(("outline", None, tuple(size), tuple(color)), build)
+
+    @staticmethod
+    def cut_frame(source, rect=None, size=None, colorkey=None):
+        if rect is not None:
+            rect = pygame.Rect(rect)
+            image = pygame.Surface(rect.size, pygame.SRCALPHA)
+            image.blit(source, (0, 0), rect)
+        else:
+            image = source
+
+        if size is not None and image.get_size() != tuple(size):
+            image = pygame.transform.scale(image, size)
+
+        if colorkey is not None:
+            if image is source:
+                image = source.copy()
+            if colorkey == -1:
+                colorkey = image.get_at((0, 0))
+            image.set_colorkey(colorkey, pygame.RLEACCEL)
+
+        return image
+
+    def clear(self):
+        self.entries.clear()
+        self.entry_bytes.clear()
+        self.total_bytes = 0
+
+    def stats(self):
+        return {
+            "entries": len(self.entries),
+            "bytes": self.total_bytes,
+            "max_bytes": self.max_bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "baked_hits": self.baked_hits,
+        }
+
+
+# Shared by every entity in the process
+asset_cache = AssetCache()
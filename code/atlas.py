@@ -0,0 +1,140 @@
+import pygame
+from .settings import ATLAS_PAGE_SIZE
+
+
+class TextureAtlas:
+    """Packs small frames into a few large pages (shelf packing).
+
+    pack() copies the frames of a sprite set into the pages and hands back
+    subsurfaces in their place, so renderers keep blitting ordinary surfaces
+    that are really sub-rects of a page. The name -> (page, rect) table makes
+    every frame findable and sprite memory measurable in one place. Packed
+    sets are kept by name for the life of the atlas, so packing a set again
+    (or sprite_set) returns the frames already in the pages. Fully opaque
+    frames go to pages without per-pixel alpha, which blit faster.
+    """
+
+    def __init__(self, page_size=ATLAS_PAGE_SIZE, padding=1):
+        self.page_size = page_size
+        self.padding = padding
+        self.pages = []
+        self.shelves = []  # Per page: list of [y, height, next free x]
+        self.entries = {}  # name -> (page index, rect)
+        self.sets = {}  # name -> packed sprite set
+
+    def new_page(self, width, height, alpha=True):
+        # Oversized frames get a page of their own
+        size = (max(self.page_size, width), max(self.page_size, height))
+        if alpha:
+            page = pygame.Surface(size, pygame.SRCALPHA)
+            if pygame.display.get_surface() is not None:
+                page = page.convert_alpha()
+            page.fill((0, 0, 0, 0))
+        else:
+            page = pygame.Surface(size)
+            if pygame.display.get_surface() is not None:
+                page = page.convert()
+        self.pages.append(page)
+        self.shelves.append([])
+        return len(self.pages) - 1
+
+    def allocate(self, width, height, alpha=True):
+        """Find room for a width x height frame on a page with or without alpha; returns (page index, rect)."""
+        padded_width = width + self.padding
+        padded_height = height + self.padding
+
+        for index, page in enumerate(self.pages):
+            if bool(page.get_flags() & pygame.SRCALPHA) != alpha:
+                continue
+            page_width, page_height = page.get_size()
+            shelves = self.shelves[index]
+
+            # First shelf that is tall enough and has room left
+            for shelf in shelves:
+                y, shelf_height, x = shelf
+                if padded_height <= shelf_height and x + padded_width <= page_width:
+                    shelf[2] += padded_width
+                    return index, pygame.Rect(x, y, width, height)
+
+            # Otherwise open a new shelf below the last one
+            top = shelves[-1][0] + shelves[-1][1] if shelves else 0
+            if top + padded_height <= page_height and padded_width <= page_width:
+                shelves.append([top, padded_height, padded_width])
+                return index, pygame.Rect(0, top, width, height)
+
+        index = self.new_page(padded_width, padded_height, alpha)
+        self.shelves[index].append([0, padded_height, padded_width])
+        return index, pygame.Rect(0, 0, width, height)
+
+    @staticmethod
+    def is_opaque(surface):
+        # No colorkey and no pixel with any transparency
+        if surface.get_colorkey() is not None:
+            return False
+        if not surface.get_flags() & pygame.SRCALPHA:
+            return True
+        return int(pygame.surfarray.array_alpha(surface).min()) == 255
+
+    def add(self, name, surface):
+        """Copy one frame into the atlas and return the subsurface that replaces it."""
+        index, rect = self.allocate(*surface.get_size(), alpha=not self.is_opaque(surface))
+        page = self.pages[index]
+        page.blit(surface, rect)
+        self.entries[name] = (index, rect)
+        return page.subsurface(rect)
+
+    def pack(self, name, value):
+        """Pack a surface or nested lists/dicts of surfaces; returns the same structure.
+
+        Frames shared within the structure (e.g. an idle frame reused by a
+        walking animation) are packed once. A name that was packed before
+        returns that set instead of copying value into the pages again.
+        """
+        packed = self.sets.get(name)
+        if packed is None:
+            packed = self.sets[name] = self.pack_frames(name, value, {})
+        return packed
+
+    def sprite_set(self, name, build):
+        """The set packed under name, packing what build() returns the first time."""
+        packed = self.sets.get(name)
+        if packed is None:
+            packed = self.pack(name, build())
+        return packed
+
+    def pack_frames(self, name, value, packed):
+        if isinstance(value, pygame.Surface):
+            if id(value) not in packed:
+                packed[id(value)] = self.add(name, value)
+            return packed[id(value)]
+        if isinstance(value, dict):
+            return {key: self.pack_frames(f"{name}/{key}", item, packed) for key, item in value.items()}
+        if isinstance(value, list):
+            return [self.pack_frames(f"{name}/{i}", item, packed) for i, item in enumerate(value)]
+        return value
+
+    def get(self, name):
+        index, rect = self.entries[name]
+        return self.pages[index].subsurface(rect)
+
+    def clear(self):
+        self.pages = []
+        self.shelves = []
+        self.entries = {}
+        self.sets = {}
+
+    def stats(self):
+        page_pixels = sum(page.get_width() * page.get_height() for page in self.pages)
+        # Frames shared under several names occupy their rect once
+        packed = set((index, tuple(rect)) for index, rect in self.entries.values())
+        used_pixels = sum(width * height for _, (_, _, width, height) in packed)
+        return {
+            "pages": len(self.pages),
+            "frames": len(self.entries),
+            "bytes": sum(page.get_width() * page.get_height() * page.get_bytesize() for page in self.pages),
+            "used": used_pixels / page_pixels if page_pixels else 0.0,
+        }
+
+
+# Frames of the tiles, crops, trees, animals and the farmer
+atlas = TextureAtlas()
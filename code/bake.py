@@ -0,0 +1,184 @@
+"""Offline asset bake: every decoded, sliced and scaled frame as raw pixels.
+
+    python -m code.bake
+
+builds a game headlessly (plus the menu and one crop of each type), so that
+every image and frame the game asks the asset cache for gets loaded, then
+writes them to BAKED_ASSET_DIR:
+
+    manifest.json   format version, size of frames.bin, the source files
+                    with their mtime, size and SHA-1, and one entry per frame:
+                    its cache key and the offset and size of its pixels
+    frames.bin      the RGBA pixels of all frames, back to back
+
+At startup the bake is memory-mapped and attached to the asset cache, which
+then builds baked frames with pygame.image.frombuffer instead of decoding and
+scaling PNGs. A source file whose mtime or size changed is re-hashed; frames
+of a source whose contents changed are ignored (and decoded as usual) until
+the next bake.
+"""
+import hashlib
+import json
+import mmap
+import os
+import time
+import pygame
+from .assets import asset_cache
+from .settings import BAKED_ASSET_DIR
+
+VERSION = 1
+MANIFEST = "manifest.json"
+FRAMES = "frames.bin"
+
+# Crops whose stage sprites are baked (any other type uses the same frames)
+CROP_TYPES = ["wheat", "carrot", "tomato"]
+
+
+def file_hash(path):
+    with open(path, "rb") as f:
+        return hashlib.sha1(f.read()).hexdigest()
+
+
+def source_info(path):
+    stat = os.stat(path)
+    return {"mtime_ns": stat.st_mtime_ns, "size": stat.st_size, "sha1": file_hash(path)}
+
+
+class BakedAssets:
+    """A bake opened for reading; load(key) builds a frame from its raw pixels."""
+
+    def __init__(self, directory, manifest, blob):
+        self.directory = directory
+        self.blob = blob
+        self.view = memoryview(blob) if len(blob) else None
+
+        # Only frames whose source file is unchanged since the bake are served
+        self.sources = set()
+        self.stale = []
+        for path, info in manifest["sources"].items():
+            if self.source_valid(path, info):
+                self.sources.add(path)
+            else:
+                self.stale.append(path)
+
+        self.frames = {}
+        for entry in manifest["frames"]:
+            key = decode_key(entry["key"])
+            if key[0] in self.sources:
+                self.frames[key] = (entry["offset"], entry["width"], entry["height"])
+
+    @staticmethod
+    def source_valid(path, info):
+        try:
+            stat = os.stat(path)
+        except OSError:
+            return False
+        if stat.st_mtime_ns == info["mtime_ns"] and stat.st_size == info["size"]:
+            return True
+
+        # Touched or copied: still valid if the contents are the same
+        return stat.st_size == info["size"] and file_hash(path) == info["sha1"]
+
+    @classmethod
+    def open(cls, directory=BAKED_ASSET_DIR):
+        """Open the bake in directory, or return None if there is no usable one."""
+        try:
+            with open(os.path.join(directory, MANIFEST)) as f:
+                manifest = json.load(f)
+            if manifest.get("version") != VERSION:
+                print("Baked assets have an old format; run python -m code.bake")
+                return None
+            with open(os.path.join(directory, FRAMES), "rb") as f:
+                size = os.fstat(f.fileno()).st_size
+                if size != manifest["bytes"]:
+                    print("Baked assets are incomplete; run python -m code.bake")
+                    return None
+                if size:
+                    blob = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+                else:
+                    blob = b""
+            # A stale or partial manifest (missing or mistyped fields) is no bake at all
+            baked = cls(directory, manifest, blob)
+        except (OSError, ValueError, KeyError, TypeError, AttributeError):
+            return None
+
+        if baked.stale:
+            print(f"Baked assets out of date for {len(baked.stale)} files; run python -m code.bake")
+        return baked
+
+    def __contains__(self, key):
+        return key in self.frames
+
+    def load(self, key):
+        entry = self.frames.get(key)
+        if entry is None:
+            return None
+        offset, width, height = entry
+        pixels = self.view[offset:offset + width * height * 4]
+        # convert_alpha copies the pixels, so the mapping is not referenced afterwards
+        return pygame.image.frombuffer(pixels, (width, height), "RGBA").convert_alpha()
+
+
+def encode_key(key):
+    return [list(part) if isinstance(part, tuple) else part for part in key]
+
+
+def decode_key(key):
+    return tuple(tuple(part) if isinstance(part, list) else part for part in key)
+
+
+def collect_frames():
+    """Build a game headlessly and return the file-based entries it loaded into the asset cache."""
+    from .game import Game
+    from .menu import Menu
+    from .plants import Plant
+
+    # Decode from the PNGs, not from an earlier bake
+    asset_cache.baked = None
+    asset_cache.clear()
+
+    game = Game(headless=True, baked_assets=False)
+    Menu(game)
+    for crop_type in CROP_TYPES:
+        Plant(game, 0, 0, crop_type)
+    game.close()
+
+    return {key: value for key, value in asset_cache.entries.items()
+            if isinstance(value, pygame.Surface) and isinstance(key[0], str) and os.path.isfile(key[0])}
+
+
+def bake(directory=BAKED_ASSET_DIR):
+    start = time.perf_counter()
+    frames = collect_frames()
+    os.makedirs(directory, exist_ok=True)
+
+    entries = []
+    offset = 0
+    temp_frames = os.path.join(directory, FRAMES + ".tmp")
+    with open(temp_frames, "wb") as f:
+        for key, surface in frames.items():
+            pixels = pygame.image.tobytes(surface, "RGBA")
+            f.write(pixels)
+            width, height = surface.get_size()
+            entries.append({"key": encode_key(key), "offset": offset, "width": width, "height": height})
+            offset += len(pixels)
+
+    manifest = {
+        "version": VERSION,
+        "bytes": offset,
+        "sources": {path: source_info(path) for path in sorted(set(key[0] for key in frames))},
+        "frames": entries,
+    }
+    temp_manifest = os.path.join(directory, MANIFEST + ".tmp")
+    with open(temp_manifest, "w") as f:
+        json.dump(manifest, f, indent=1)
+
+    # Swap the pixels in before the manifest that points into them
+    os.replace(temp_frames, os.path.join(directory, FRAMES))
+    os.replace(temp_manifest, os.path.join(directory, MANIFEST))
+    print(f"Baked {len(entries)} frames from {len(manifest['sources'])} files "
+          f"({offset / (1024 * 1024):.1f} MB) into {directory} in {time.perf_counter() - start:.2f} s")
+
+
+if __name__ == "__main__":
+    bake()
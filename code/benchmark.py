@@ -0,0 +1,217 @@
+"""Frame-time benchmarks over named scenarios.
+
+Each scenario builds a headless game, populates it and runs a fixed number of
+update+render frames offscreen, timing each subsystem separately and measuring
+blit throughput (sprites per millisecond) of the terrain and entity layers.
+Results are written as JSON so runs from different commits can be compared:
+
+    python -m code.benchmark
+    python -m code.benchmark --scenarios plants_10k animals_1k --frames 300
+    python -m code.benchmark --output new.json --compare old.json
+"""
+import argparse
+import json
+import platform
+import random
+import subprocess
+import time
+import numpy as np
+import pygame
+from .game import Game
+from .plants import Plant
+from .animals import AnimalManager
+
+# Timed parts of a frame, in the order they run
+SUBSYSTEMS = ["world_update", "player_update", "world_render", "player_render"]
+
+
+def populate_plants(game, count):
+    # Crops on random tiles of the world, of every type
+    world = game.world
+    plant_manager = world.plant_manager
+    for _ in range(count):
+        x = random.randrange(world.grid_width) * world.tile_size
+        y = random.randrange(world.grid_height) * world.tile_size
+        plant_type = random.choice(["wheat", "carrot", "tomato"])
+        plant_manager.add_plant(Plant(game, x, y, plant_type, plant_manager.crops))
+
+
+def populate_animals(game, count, batched=False):
+    if batched:
+        game.world.animal_manager.clear()
+        world = game.world
+        world.animal_manager = AnimalManager(game, world.render_queue, batched=True, bounds=(world.width, world.height))
+    animal_manager = game.world.animal_manager
+    for _ in range(count):
+        x = random.randint(0, game.WIDTH - 32)
+        y = random.randint(0, game.HEIGHT - 32)
+        animal_type = random.choice(["chicken", "cow", "sheep"])
+        animal_manager.add_animal(x, y, animal_type, is_baby=random.random() < 0.25)
+
+
+# Composed at native pixel-art size and scaled up once, as with NATIVE_RESOLUTION
+NATIVE = {"native_resolution": True}
+
+# name: (Game keyword arguments or None, setup function or None)
+SCENARIOS = {
+    "default": (None, None),
+    "default_native": (NATIVE, None),
+    "plants_1k": (None, lambda game: populate_plants(game, 1000)),
+    "plants_10k": (None, lambda game: populate_plants(game, 10000)),
+    "plants_100k": (None, lambda game: populate_plants(game, 100000)),
+    "plants_10k_native": (NATIVE, lambda game: populate_plants(game, 10000)),
+    "animals_100": (None, lambda game: populate_animals(game, 100)),
+    "animals_1k": (None, lambda game: populate_animals(game, 1000)),
+    "animals_10k": (None, lambda game: populate_animals(game, 10000)),
+    "animals_10k_batched": (None, lambda game: populate_animals(game, 10000, batched=True)),
+    "large_map": ({"world_size": (256, 256)}, None),
+    "huge_map": ({"world_size": (1024, 1024)}, None),
+}
+
+
+def percentiles(samples):
+    samples = np.array(samples) * 1000.0  # Milliseconds
+    return {
+        "p50_ms": round(float(np.percentile(samples, 50)), 4),
+        "p95_ms": round(float(np.percentile(samples, 95)), 4),
+        "p99_ms": round(float(np.percentile(samples, 99)), 4),
+        "mean_ms": round(float(samples.mean()), 4),
+    }
+
+
+def run_scenario(name, frames, seed=0):
+    options, setup = SCENARIOS[name]
+
+    # Same world and population on every run
+    random.seed(seed)
+    np.random.seed(seed)
+
+    start = time.perf_counter()
+    game = Game(headless=True, **(options or {}))
+    if setup:
+        setup(game)
+    setup_time = time.perf_counter() - start
+
+    world = game.world
+    player = game.player
+    screen = game.screen
+    dt = game.dt
+    timings = {subsystem: [] for subsystem in SUBSYSTEMS}
+    timings["frame"] = []
+
+    # The player is queued by World.render_entities in depth order; time it from inside
+    player_render_time = [0.0]
+    add_player_blits = player.add_blits
+
+    def timed_player_blits(*args):
+        start = time.perf_counter()
+        add_player_blits(*args)
+        player_render_time[0] += time.perf_counter() - start
+
+    player.add_blits = timed_player_blits
+
+    # Sprites blitted and seconds spent per layer, for throughput
+    blits = {"terrain": 0, "entity": 0}
+    layer_time = {"terrain": 0.0, "entity": 0.0}
+
+    for _ in range(frames):
+        player_render_time[0] = 0.0
+        t0 = time.perf_counter()
+        world.update(dt)
+        t1 = time.perf_counter()
+        player.update(dt)
+        world.render_queue.update(player)
+        t2 = time.perf_counter()
+        screen.fill((0, 0, 0))
+        world.camera.update()
+        target = world.view_target(screen)
+        layer_start = time.perf_counter()
+        world.render_terrain(target)
+        layer_end = time.perf_counter()
+        world.render_entities(target)
+        world.present_view(target, screen)
+        t3 = time.perf_counter()
+
+        layer_time["terrain"] += layer_end - layer_start
+        layer_time["entity"] += t3 - layer_end
+        blits["terrain"] += world.terrain_blits
+        blits["entity"] += world.entity_blits
+
+        timings["world_update"].append(t1 - t0)
+        timings["player_update"].append(t2 - t1)
+        timings["world_render"].append(t3 - t2 - player_render_time[0])
+        timings["player_render"].append(player_render_time[0])
+        timings["frame"].append(t3 - t0)
+
+    game.close()
+    pygame.quit()
+    return {
+        "frames": frames,
+        "setup_s": round(setup_time, 3),
+        "timings": {part: percentiles(samples) for part, samples in timings.items()},
+        "sprites_per_ms": {layer: round(blits[layer] / (layer_time[layer] * 1000.0), 1) if layer_time[layer] else None
+                           for layer in blits},
+        "sprites_per_frame": {layer: blits[layer] // frames for layer in blits},
+    }
+
+
+def current_commit():
+    try:
+        return subprocess.check_output(["git", "rev-parse", "--short", "HEAD"],
+                                       stderr=subprocess.DEVNULL, text=True).strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def print_comparison(results, baseline):
+    print(f"\nFrame p50 vs {baseline.get('commit')}:")
+    for name, result in results["scenarios"].items():
+        old = baseline["scenarios"].get(name)
+        if old is None:
+            continue
+        new_ms = result["timings"]["frame"]["p50_ms"]
+        old_ms = old["timings"]["frame"]["p50_ms"]
+        ratio = new_ms / old_ms if old_ms else float("inf")
+        print(f"  {name:22s} {old_ms:9.3f} ms -> {new_ms:9.3f} ms  ({ratio:.2f}x)")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run frame-time benchmark scenarios")
+    parser.add_argument("--scenarios", nargs="+", choices=list(SCENARIOS), default=list(SCENARIOS))
+    parser.add_argument("--frames", type=int, default=600, help="frames per scenario")
+    parser.add_argument("--output", default="benchmark_results.json")
+    parser.add_argument("--compare", help="results file of an earlier run to compare against")
+    args = parser.parse_args()
+
+    results = {
+        "commit": current_commit(),
+        "python": platform.python_version(),
+        "pygame": pygame.version.ver,
+        "numpy": np.__version__,
+        "scenarios": {},
+    }
+
+    for name in args.scenarios:
+        print(f"Running scenario {name}...")
+        result = run_scenario(name, args.frames)
+        results["scenarios"][name] = result
+        timings = result["timings"]
+        print(f"  frame p50 {timings['frame']['p50_ms']:.3f} ms, p95 {timings['frame']['p95_ms']:.3f} ms, "
+              f"p99 {timings['frame']['p99_ms']:.3f} ms")
+        for subsystem in SUBSYSTEMS:
+            print(f"    {subsystem:14s} p50 {timings[subsystem]['p50_ms']:.3f} ms, "
+                  f"p99 {timings[subsystem]['p99_ms']:.3f} ms")
+        for layer, rate in result["sprites_per_ms"].items():
+            print(f"    {layer + ' blits':14s} {result['sprites_per_frame'][layer]} per frame, {rate} sprites/ms")
+
+    with open(args.output, "w") as f:
+        json.dump(results, f, indent=2)
+    print(f"Results written to {args.output}")
+
+    if args.compare:
+        with open(args.compare) as f:
+            print_comparison(results, json.load(f))
+
+
+if __name__ == "__main__":
+    main()
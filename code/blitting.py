@@ -0,0 +1,19 @@
+import pygame
+
+# pygame-ce's Surface.fblits skips building the list of changed rects that blits returns
+HAVE_FBLITS = hasattr(pygame.Surface, "fblits")
+
+
+def blit_all(surface, draw_list):
+    """Blit a sequence of (source, position) pairs onto surface in one call."""
+    if HAVE_FBLITS:
+        surface.fblits(draw_list)
+    else:
+        surface.blits(draw_list, doreturn=False)
+
+
+def render_blits(obj, surface, offset=(0, 0)):
+    # Draw a single entity on its own (dirty-rect redraws) through its add_blits
+    draw_list = []
+    obj.add_blits(draw_list, offset)
+    blit_all(surface, draw_list)
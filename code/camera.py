@@ -0,0 +1,78 @@
+import math
+import pygame
+from .settings import CAMERA_MIN_ZOOM, CAMERA_MAX_ZOOM
+
+
+class Camera:
+    """The part of the world shown on screen: a position, a zoom and an optional target.
+
+    x and y are the world coordinates of the top-left corner of the view. At a
+    zoom of 2 the view covers half the screen's size in world pixels, which is
+    then scaled up to fill the screen. Renderers draw entities at their world
+    position minus offset(). With a pixel_scale above 1 the view is composed at
+    native pixel-art resolution, pixel_scale world pixels to one view pixel.
+    """
+
+    def __init__(self, screen_size, world_size, zoom=1.0, pixel_scale=1):
+        self.screen_width, self.screen_height = screen_size
+        self.world_width, self.world_height = world_size
+        self.x = 0.0
+        self.y = 0.0
+        self.zoom = zoom
+        self.pixel_scale = pixel_scale
+        self.target = None
+
+        # Off-screen surface the view is drawn into when zoomed or at native resolution
+        self.view = None
+
+    @property
+    def view_width(self):
+        return math.ceil(self.screen_width / self.zoom)
+
+    @property
+    def view_height(self):
+        return math.ceil(self.screen_height / self.zoom)
+
+    def follow(self, target):
+        """Keep target (anything with render_pos, width and height) centred on screen."""
+        self.target = target
+
+    def set_zoom(self, zoom):
+        self.zoom = max(CAMERA_MIN_ZOOM, min(CAMERA_MAX_ZOOM, zoom))
+        self.update()
+
+    def update(self):
+        # Called once per rendered frame, so it tracks the interpolated position
+        if self.target is not None:
+            target_x, target_y = self.target.render_pos()
+            self.x = target_x + self.target.width / 2 - self.view_width / 2
+            self.y = target_y + self.target.height / 2 - self.view_height / 2
+
+        # Stay inside the world; a world smaller than the view stays in the corner
+        self.x = max(0, min(self.world_width - self.view_width, self.x))
+        self.y = max(0, min(self.world_height - self.view_height, self.y))
+
+    def offset(self):
+        # Whole view pixels, so the terrain and the entities scroll together
+        scale = self.pixel_scale
+        return int(self.x) // scale * scale, int(self.y) // scale * scale
+
+    def get_viewport(self):
+        """Area of the world in view, in world coordinates."""
+        x, y = self.offset()
+        return pygame.Rect(x, y, self.view_width, self.view_height)
+
+    def view_surface(self):
+        # Reused between frames; only reallocated when the zoom or pixel scale changes its size
+        size = (math.ceil(self.view_width / self.pixel_scale), math.ceil(self.view_height / self.pixel_scale))
+        if self.view is None or self.view.get_size() != size:
+            self.view = pygame.Surface(size)
+        return self.view
+
+    def world_to_screen(self, x, y):
+        offset_x, offset_y = self.offset()
+        return (x - offset_x) * self.zoom, (y - offset_y) * self.zoom
+
+    def screen_to_world(self, x, y):
+        offset_x, offset_y = self.offset()
+        return x / self.zoom + offset_x, y / self.zoom + offset_y
@@ -0,0 +1,191 @@
+import os
+import shutil
+import tempfile
+import numpy as np
+
+
+def read_chunk_file(path, chunk_size):
+    """Tiles of a chunk evicted to disk, as a (chunk_size, chunk_size) array."""
+    with open(path, "rb") as f:
+        return np.frombuffer(f.read(), dtype=np.uint8).reshape(chunk_size, chunk_size).copy()
+
+
+class Chunk:
+    def __init__(self, cx, cy, size, tiles):
+        self.cx = cx
+        self.cy = cy
+        self.size = size
+
+        # Tile codes as a (size, size) uint8 array indexed [y, x]
+        self.tiles = tiles
+
+        # Only chunks changed since generation need to be written to disk
+        self.modified = False
+
+        # Baked terrain surface (only kept while the chunk is on screen)
+        self.surface = None
+        self.dirty_tiles = set()
+
+    def get(self, x, y):
+        return int(self.tiles[y, x])
+
+    def set(self, x, y, tile_type):
+        if self.tiles[y, x] == tile_type:
+            return False
+
+        self.tiles[y, x] = tile_type
+        self.modified = True
+        if self.surface is not None:
+            self.dirty_tiles.add((x, y))
+        return True
+
+
+class ChunkStore:
+    """Fixed-size tile chunks, generated or loaded on demand and evicted to disk.
+
+    Chunks are addressed by chunk coordinates; tile coordinates are split into
+    a chunk coordinate and a local offset. Unmodified chunks are simply dropped
+    on eviction since generation is deterministic per chunk. Evicted chunks go
+    to a directory of this store's own under cache_root, so several games (or
+    benchmarks and bakes) can run side by side.
+    """
+
+    def __init__(self, chunk_size, generator, cache_root, max_chunk=None):
+        self.chunk_size = chunk_size
+
+        # Largest valid chunk coordinates (max_cx, max_cy); chunks start at (0, 0)
+        self.max_chunk = max_chunk
+        self.generator = generator
+        self.cache_root = cache_root
+        self.cache_dir = None  # Created on the first eviction of a modified chunk
+        self.chunks = {}
+
+        # Modified chunks written to cache_dir, and tiles of modified chunks from a
+        # loaded save that have not been needed yet
+        self.on_disk = set()
+        self.restored = {}
+
+        # Chunk range currently kept in memory (min_cx, min_cy, max_cx, max_cy)
+        self.loaded_range = None
+
+        # Statistics
+        self.generated = 0
+        self.loaded_from_disk = 0
+        self.evicted = 0
+
+    def chunk_path(self, cx, cy):
+        return os.path.join(self.cache_dir, f"chunk_{cx}_{cy}.bin")
+
+    def get_chunk(self, cx, cy):
+        chunk = self.chunks.get((cx, cy))
+        if chunk is None:
+            chunk = self.load_chunk(cx, cy)
+            self.chunks[(cx, cy)] = chunk
+        return chunk
+
+    def load_chunk(self, cx, cy):
+        tiles = self.restored.pop((cx, cy), None)
+        if tiles is not None:
+            chunk = Chunk(cx, cy, self.chunk_size, tiles)
+            chunk.modified = True
+            return chunk
+
+        if (cx, cy) in self.on_disk:
+            tiles = read_chunk_file(self.chunk_path(cx, cy), self.chunk_size)
+            chunk = Chunk(cx, cy, self.chunk_size, tiles)
+            chunk.modified = True  # Differs from the generated version
+            self.loaded_from_disk += 1
+            return chunk
+
+        self.generated += 1
+        return Chunk(cx, cy, self.chunk_size, self.generator(cx, cy))
+
+    def save_chunk(self, chunk):
+        if self.cache_dir is None:
+            os.makedirs(self.cache_root, exist_ok=True)
+            self.cache_dir = tempfile.mkdtemp(prefix="chunks-", dir=self.cache_root)
+        # Swapped in whole, so a save being written on another thread never reads half a file
+        path = self.chunk_path(chunk.cx, chunk.cy)
+        with open(path + ".tmp", "wb") as f:
+            f.write(chunk.tiles.tobytes())
+        os.replace(path + ".tmp", path)
+        self.on_disk.add((chunk.cx, chunk.cy))
+
+    def evict_chunk(self, cx, cy):
+        chunk = self.chunks.pop((cx, cy))
+        if chunk.modified:
+            self.save_chunk(chunk)
+        self.evicted += 1
+
+    def get_tile(self, x, y):
+        size = self.chunk_size
+        return self.get_chunk(x // size, y // size).get(x % size, y % size)
+
+    def set_tile(self, x, y, tile_type):
+        size = self.chunk_size
+        return self.get_chunk(x // size, y // size).set(x % size, y % size, tile_type)
+
+    def stream(self, min_cx, min_cy, max_cx, max_cy, margin=1):
+        """Keep chunks in the given range (plus a margin) loaded and evict the rest."""
+        for _ in self.stream_steps(min_cx, min_cy, max_cx, max_cy, margin):
+            pass
+
+    def stream_steps(self, min_cx, min_cy, max_cx, max_cy, margin=1):
+        # Same as stream, yielding after each chunk that had to be generated or loaded
+        wanted = (max(0, min_cx - margin), max(0, min_cy - margin), max_cx + margin, max_cy + margin)
+        if self.max_chunk is not None:
+            wanted = (wanted[0], wanted[1], min(wanted[2], self.max_chunk[0]), min(wanted[3], self.max_chunk[1]))
+        if wanted == self.loaded_range:
+            return
+        self.loaded_range = wanted
+
+        # Evict chunks well outside the range (one extra chunk of hysteresis)
+        for cx, cy in list(self.chunks):
+            if (cx < wanted[0] - 1 or cx > wanted[2] + 1 or
+                    cy < wanted[1] - 1 or cy > wanted[3] + 1):
+                self.evict_chunk(cx, cy)
+
+        for cx in range(wanted[0], wanted[2] + 1):
+            for cy in range(wanted[1], wanted[3] + 1):
+                if (cx, cy) not in self.chunks:
+                    self.get_chunk(cx, cy)
+                    yield
+
+    def restore(self, chunks):
+        # Tiles of the modified chunks of a saved game, {(cx, cy): array}; the
+        # other chunks are regenerated from the seed
+        self.restored = dict(chunks)
+
+    def modified_chunks(self):
+        """Every chunk that differs from its generated version, without touching the disk.
+
+        Returns ({(cx, cy): array}, {(cx, cy): path}): copies of the tiles of
+        chunks in memory or restored from a save and not loaded yet, and the
+        files of chunks evicted to disk, for read_chunk_file on another thread.
+        """
+        modified = {key: tiles.copy() for key, tiles in self.restored.items()}
+        for key, chunk in self.chunks.items():
+            if chunk.modified:
+                modified[key] = chunk.tiles.copy()
+        evicted = {key: self.chunk_path(*key) for key in self.on_disk if key not in self.chunks}
+        return modified, evicted
+
+    def discard(self):
+        # Forget every chunk and delete the files of this store
+        self.chunks.clear()
+        self.restored.clear()
+        self.on_disk.clear()
+        self.loaded_range = None
+        if self.cache_dir is not None:
+            shutil.rmtree(self.cache_dir, ignore_errors=True)
+            self.cache_dir = None
+
+    def close(self):
+        # End of the session: the evicted chunks are not needed by anything else
+        self.discard()
+
+    def flush(self):
+        # Write every modified chunk still in memory
+        for chunk in self.chunks.values():
+            if chunk.modified:
+                self.save_chunk(chunk)
@@ -0,0 +1,232 @@
+import numpy as np
+from .scheduler import EventQueue
+
+
+class CropField:
+    """All crops of a field stored as contiguous NumPy columns.
+
+    Row i holds the position, type, growth stage and watering state of one
+    crop. Growth is deterministic given the watering state, so instead of
+    being polled every frame, each crop's next stage change is computed
+    analytically and queued as an event; frames where nothing ripens cost
+    nothing per crop. Plant objects are thin views onto their row (see views).
+
+    The growth timer is stored as its value (timer_base) at a reference time
+    (time_base); together with water_until that is enough to derive the timer
+    and water level at any later time.
+    """
+
+    max_growth_stage = 3
+    growth_rate = 0.3  # Growth per second (0.005 per frame at 60 FPS)
+    water_drain_rate = 0.06  # Water level lost per second (0.001 per frame at 60 FPS)
+
+    def __init__(self, capacity=64):
+        self.count = 0
+        self.capacity = capacity
+
+        # Current game time, in seconds
+        self.now = 0.0
+        self.events = EventQueue()
+
+        # Plant type names, indexed by the type column
+        self.type_names = []
+        self.type_codes = {}
+
+        # Stable ids survive rows being moved by removals; events refer to ids
+        self.next_id = 0
+        self.index_of_id = np.full(capacity, -1, dtype=np.int64)
+
+        self.x = np.zeros(capacity, dtype=np.int32)
+        self.y = np.zeros(capacity, dtype=np.int32)
+        self.type = np.zeros(capacity, dtype=np.uint8)
+        self.stage = np.zeros(capacity, dtype=np.uint8)
+        self.timer_base = np.zeros(capacity, dtype=np.float64)
+        self.time_base = np.zeros(capacity, dtype=np.float64)
+        self.water_until = np.zeros(capacity, dtype=np.float64)
+        self.id = np.zeros(capacity, dtype=np.int64)
+        self.version = np.zeros(capacity, dtype=np.int64)
+
+        # View object of each row, kept in row order (mutated in place, never replaced)
+        self.views = []
+
+    def columns(self):
+        return ("x", "y", "type", "stage", "timer_base", "time_base", "water_until", "id", "version")
+
+    def type_code(self, plant_type):
+        code = self.type_codes.get(plant_type)
+        if code is None:
+            code = len(self.type_names)
+            self.type_names.append(plant_type)
+            self.type_codes[plant_type] = code
+        return code
+
+    def grow_capacity(self):
+        self.capacity *= 2
+        for name in self.columns():
+            column = getattr(self, name)
+            grown = np.zeros(self.capacity, dtype=column.dtype)
+            grown[:self.count] = column[:self.count]
+            setattr(self, name, grown)
+
+    def add(self, x, y, plant_type, view=None):
+        """Append a crop planted now and return its row index."""
+        if self.count == self.capacity:
+            self.grow_capacity()
+
+        index = self.count
+        self.x[index] = x
+        self.y[index] = y
+        self.type[index] = self.type_code(plant_type)
+        self.stage[index] = 0
+        self.timer_base[index] = 0
+        self.time_base[index] = self.now
+        self.water_until[index] = -np.inf
+        self.id[index] = self.next_id
+        self.version[index] = 0
+
+        if self.next_id == len(self.index_of_id):
+            self.index_of_id = np.concatenate([self.index_of_id, np.full(len(self.index_of_id), -1, dtype=np.int64)])
+        self.index_of_id[self.next_id] = index
+        self.next_id += 1
+        self.count += 1
+        self.views.append(view)
+
+        self.schedule_growth(index)
+        return index
+
+    def load_rows(self, records, type_names):
+        """Append saved crops in bulk and plan their growth; returns the first new row.
+
+        records is a structured array with x, y, type (an index into
+        type_names), stage, timer_base, time_base and water_until fields.
+        Views are attached by the caller.
+        """
+        count = len(records)
+        while self.count + count > self.capacity:
+            self.grow_capacity()
+
+        start = self.count
+        rows = slice(start, start + count)
+        codes = np.array([self.type_code(name) for name in type_names], dtype=np.uint8)
+        self.x[rows] = records["x"]
+        self.y[rows] = records["y"]
+        self.type[rows] = codes[records["type"]] if count else 0
+        self.stage[rows] = records["stage"]
+        self.timer_base[rows] = records["timer_base"]
+        self.time_base[rows] = records["time_base"]
+        self.water_until[rows] = records["water_until"]
+        self.version[rows] = 0
+
+        ids = np.arange(self.next_id, self.next_id + count)
+        self.id[rows] = ids
+        if self.next_id + count > len(self.index_of_id):
+            grown = np.full(max(2 * len(self.index_of_id), self.next_id + count), -1, dtype=np.int64)
+            grown[:len(self.index_of_id)] = self.index_of_id
+            self.index_of_id = grown
+        self.index_of_id[ids] = np.arange(start, start + count)
+        self.next_id += count
+        self.count += count
+        self.views.extend([None] * count)
+
+        growing = np.arange(start, start + count)[self.stage[rows] < self.max_growth_stage]
+        self.events.schedule_many(self.next_stage_time(growing).tolist(), self.id[growing].tolist(),
+                                  [0] * len(growing))
+        return start
+
+    def remove(self, index):
+        self.index_of_id[self.id[index]] = -1
+
+        # Move the last row into the freed one so the columns stay contiguous
+        last = self.count - 1
+        if index != last:
+            for name in self.columns():
+                column = getattr(self, name)
+                column[index] = column[last]
+            self.index_of_id[self.id[index]] = index
+
+            moved = self.views[last]
+            self.views[index] = moved
+            if moved is not None:
+                moved.index = index
+
+        self.views.pop()
+        self.count -= 1
+
+    def growth_timer_at(self, index, time):
+        # Watered crops grow twice as fast until the water runs out
+        time_base = self.time_base[index]
+        fast_time = max(0.0, min(time, self.water_until[index]) - time_base)
+        slow_time = (time - time_base) - fast_time
+        return self.timer_base[index] + self.growth_rate * (2.0 * fast_time + slow_time)
+
+    def next_stage_time(self, index):
+        # Works on a single row or on an array of rows
+        needed = 1.0 - self.timer_base[index]
+        time_base = self.time_base[index]
+        fast_growth = np.maximum(0.0, self.water_until[index] - time_base) * 2.0 * self.growth_rate
+
+        return np.where(fast_growth >= needed,
+                        time_base + needed / (2.0 * self.growth_rate),
+                        np.maximum(time_base, self.water_until[index]) + (needed - fast_growth) / self.growth_rate)
+
+    def schedule_growth(self, index):
+        if self.stage[index] < self.max_growth_stage:
+            self.events.schedule(float(self.next_stage_time(index)), int(self.id[index]), int(self.version[index]))
+
+    def water(self, index):
+        # Fold the growth so far into the timer, then plan with the new water
+        now = self.now
+        self.timer_base[index] = self.growth_timer_at(index, now)
+        self.time_base[index] = now
+        self.water_until[index] = now + 1.0 / self.water_drain_rate
+
+        # Any event planned with the old water state is now stale
+        self.version[index] += 1
+        self.schedule_growth(index)
+
+    def set_stage(self, index, stage):
+        # Jump to a stage with a fresh timer, dropping the planned stage change
+        self.stage[index] = stage
+        self.timer_base[index] = 0
+        self.time_base[index] = self.now
+        self.version[index] += 1
+        self.schedule_growth(index)
+
+    def is_watered(self, index):
+        return self.water_until[index] > self.now
+
+    def water_level(self, index):
+        return max(0.0, (self.water_until[index] - self.now) * self.water_drain_rate)
+
+    def growth_timer(self, index):
+        if self.stage[index] >= self.max_growth_stage:
+            return 0.0
+        return self.growth_timer_at(index, self.now)
+
+    def advance(self, now):
+        """Move the field to game time now, applying every stage change due by then."""
+        self.now = now
+
+        # Apply all due stage changes at once; repeat in case a big time step
+        # makes the following stage due as well
+        due = list(self.events.pop_due(now))
+        while due:
+            times, crop_ids, versions = (np.array(column) for column in zip(*due))
+            indices = self.index_of_id[crop_ids]
+            valid = indices >= 0
+            valid[valid] = self.version[indices[valid]] == versions[valid]  # Skip replanned crops
+            indices = indices[valid]
+            times = times[valid]
+
+            # Each crop reaches its next stage; the timer restarts from the event time
+            self.stage[indices] += 1
+            self.timer_base[indices] = 0
+            self.time_base[indices] = times
+
+            # Plan the following stage for crops that are still growing
+            growing = indices[self.stage[indices] < self.max_growth_stage]
+            for time, crop_id, version in zip(self.next_stage_time(growing).tolist(),
+                                              self.id[growing].tolist(), self.version[growing].tolist()):
+                self.events.schedule(time, crop_id, version)
+
+            due = list(self.events.pop_due(now))
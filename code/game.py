@@ -1,23 +1,64 @@
 import pygame
 import sys
 import os
+import time
 from .menu import Menu
 from .world import World
 from .player import Player
+from .ui import PerformanceOverlay
+from .preload import AssetPreloader
+from .assets import asset_cache
+from .bake import BakedAssets
+from .save import Autosaver, load_game
+from .settings import (DIRTY_RECT_RENDERING, TICK_RATE, MAX_FRAME_TIME, SAVE_PATH, SAVE_COMPRESSION, AUTOSAVE_INTERVAL,
+                       ASSET_FILES, CAMERA_ZOOM_STEP, WINDOW_SCALE, LOADING_POLL_TIMEOUT, PIXEL_ART_SCALE,
+                       NATIVE_RESOLUTION)
 
 
 class Game:
-    def __init__(self):
+    def __init__(self, headless=False, world_size=None, baked_assets=True, native_resolution=NATIVE_RESOLUTION):
+        self.start_time = time.perf_counter()
+
+        # Headless games simulate without a window, sound or input, e.g. on servers.
+        # SDL's dummy video driver still supports surfaces and image conversion.
+        self.headless = headless
+        if headless:
+            os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+            os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
         # Initialize pygame
         pygame.init()
-        pygame.mixer.init()
+        if not headless:
+            pygame.mixer.init()
 
         # Game settings
         self.WIDTH, self.HEIGHT = 800, 600
-        self.screen = pygame.display.set_mode((self.WIDTH, self.HEIGHT))
+        self.world_size = world_size  # World size in tiles, overriding the settings
+
+        # World pixels per pixel of the sprite art. At native resolution sprites are
+        # loaded at the art's own size and the world is composed at 1 / pixel_scale
+        self.pixel_scale = PIXEL_ART_SCALE if native_resolution else 1
+
+        # Everything is laid out on a WIDTH x HEIGHT screen; a larger window gets the
+        # world view, or the finished screen, scaled up into it by a whole factor
+        self.window_scale = 1 if headless else WINDOW_SCALE
+        self.window = pygame.display.set_mode((self.WIDTH * self.window_scale, self.HEIGHT * self.window_scale))
+        self.screen = self.window if self.window_scale == 1 else pygame.Surface((self.WIDTH, self.HEIGHT))
         pygame.display.set_caption("Pixel Farm")
+
+        # Frames from the asset bake skip PNG decoding and scaling (python -m code.bake)
+        if baked_assets and asset_cache.baked is None:
+            asset_cache.baked = BakedAssets.open()
         self.clock = pygame.time.Clock()
-        self.FPS = 60
+        self.FPS = 60  # Render rate cap
+
+        # Fixed-timestep simulation: whole ticks of dt seconds are run for the elapsed real time
+        self.tick_rate = TICK_RATE
+        self.dt = 1.0 / TICK_RATE
+        self.accumulator = 0.0
+
+        # Fraction of a tick between the last two simulated states, used to interpolate rendering
+        self.alpha = 1.0
 
         # Create necessary directories
         self.create_directories()
@@ -27,20 +68,88 @@ class Game:
 
         # Game states
         self.running = True
-        self.in_menu = True
+        self.in_menu = not headless
+        self.first_frame_time = None
 
-        # Initialize game components
-        self.menu = Menu(self)
-        self.world = World(self)
+        # Dirty-rectangle rendering: only the screen areas that changed are redrawn and pushed
+        self.dirty_rendering = DIRTY_RECT_RENDERING
+        self.full_redraw = True
+        self.render_states = {}
+        self.last_camera = None  # Camera offset and zoom of the last frame drawn
+
+        # Initialize game components; the menu comes up first and everything else
+        # is built step by step while it is shown (see load_steps)
+        self.menu = None if headless else Menu(self)
+        self.world = None
+        self.player = None
+        self.overlay = None
+        self.autosaver = None
+
+        self.loading_progress = 0.0
+        self.finishing_load = False
+        self.loader = self.load_steps()
+
+        # Nothing to show in headless mode, so build everything now
+        if headless:
+            self.finish_loading()
+
+    def load_steps(self):
+        """Build the game world in small steps; yields between steps so frames can be drawn.
+
+        A step yields True while it is only waiting on background work, so the
+        frame can go on instead of spending its loading budget polling.
+        """
+        # Load game assets (decoded in the background while the menu is shown)
+        yield from self.load_assets()
+
+        self.world = World(self, build=False)
+        for _ in self.world.build_steps():
+            self.loading_progress = min(0.85, self.loading_progress + 0.01)
+            yield
+        self.loading_progress = 0.85
+        yield
 
         # Initialize player in the center of the screen, but not on top of the house
         self.player = Player(self, self.WIDTH // 2, self.HEIGHT // 2 + 100)
+        self.world.render_queue.add(self.player)
+        self.world.camera.follow(self.player)
+        self.loading_progress = 0.95
+        yield
 
         # Now that world is fully initialized, spawn trees
         self.world.plant_manager.spawn_initial_trees()
 
-        # Load game assets
-        self.load_assets()
+        # Debug performance overlay (F3)
+        self.overlay = PerformanceOverlay(self)
+
+        # Saves (F5 to save, F9 to load) are written in the background
+        if not self.headless:
+            self.autosaver = Autosaver(self, SAVE_PATH, AUTOSAVE_INTERVAL, SAVE_COMPRESSION)
+
+        self.loading_progress = 1.0
+        print(f"Game loaded in {time.perf_counter() - self.start_time:.3f} s since start")
+
+    def loading(self):
+        return self.loader is not None
+
+    def advance_loading(self, budget=0.008):
+        # Run loading steps for at most about budget seconds of this frame
+        deadline = time.perf_counter() + budget
+        while self.loader is not None and time.perf_counter() < deadline:
+            try:
+                if next(self.loader):
+                    break  # Waiting on the asset threads; nothing more to do this frame
+            except StopIteration:
+                self.loader = None
+
+    def finish_loading(self):
+        # Block until the game is fully built (e.g. when "Start Game" is chosen early)
+        self.finishing_load = True
+        while self.loader is not None:
+            try:
+                next(self.loader)
+            except StopIteration:
+                self.loader = None
 
     def create_directories(self):
         """Create necessary directories for assets"""
@@ -89,9 +198,22 @@ class Game:
             print(f"Error saving tree images: {e}")
 
     def load_assets(self):
-        # This method would load all necessary game assets
-        # For demonstration, we'll just print a message
+        # Decode the game's images on worker threads; the main thread converts them for
+        # the display as they arrive, between menu frames
         print("Loading game assets...")
+        baked = asset_cache.baked
+        preloader = AssetPreloader(ASSET_FILES, skip=baked.sources if baked else ())
+        preloader.start()
+
+        while not preloader.done():
+            # Sleep briefly on the futures rather than spinning on them
+            finished = preloader.poll(timeout=None if self.finishing_load else LOADING_POLL_TIMEOUT)
+            self.loading_progress = 0.8 * preloader.progress()
+            yield finished == 0
+
+        preloader.shutdown()
+        print(f"Preloaded {preloader.total - preloader.failed} images in "
+              f"{time.perf_counter() - self.start_time:.3f} s since start")
 
     def handle_events(self):
         for event in pygame.event.get():
@@ -106,38 +228,224 @@ class Game:
                 if event.type == pygame.KEYDOWN:
                     if event.key == pygame.K_ESCAPE:
                         self.in_menu = True
+                    elif event.key == pygame.K_F3:
+                        self.overlay.toggle()
+                    elif event.key == pygame.K_F5:
+                        self.autosaver.save()
+                    elif event.key == pygame.K_F9:
+                        self.load_game()
+                    elif event.key in (pygame.K_EQUALS, pygame.K_PLUS, pygame.K_KP_PLUS):
+                        self.world.camera.set_zoom(self.world.camera.zoom * CAMERA_ZOOM_STEP)
+                    elif event.key in (pygame.K_MINUS, pygame.K_KP_MINUS):
+                        self.world.camera.set_zoom(self.world.camera.zoom / CAMERA_ZOOM_STEP)
 
                 # Pass events to player
                 self.player.handle_event(event)
 
-    def update(self):
+    def load_game(self, path=SAVE_PATH):
+        self.finish_loading()
+
+        # Make sure a save still being written is complete first
+        if self.autosaver:
+            self.autosaver.wait()
+        try:
+            start = time.perf_counter()
+            load_game(self, path)
+            print(f"Game loaded from {path} ({time.perf_counter() - start:.3f} s)")
+            return True
+        except (OSError, ValueError) as e:
+            print(f"Error loading game: {e}")
+            return False
+
+    def update(self, dt):
         if self.in_menu:
-            self.menu.update()
+            self.menu.update(dt)
         else:
-            self.world.update()
-            self.player.update()
+            self.world.update(dt)
+            self.player.update(dt)
+            self.world.render_queue.update(self.player)
             # Update all game entities here
 
     def render(self):
+        if not self.in_menu:
+            self.world.camera.update()
+
+        if self.dirty_rendering and not self.in_menu:
+            self.render_dirty()
+            return
+
+        # The next dirty-rect frame has to start from a complete picture
+        self.full_redraw = True
+
         self.screen.fill((0, 0, 0))  # Clear screen
 
         if self.in_menu:
             self.menu.render(self.screen)
+            self.present()
+        else:
+            # The world's view is scaled into the window in one step
+            self.world.render(self.screen, self.window)
+            self.present(in_window=True)
+
+    def present(self, rects=None, in_window=False):
+        """Push the frame (or only the given rects of it) to the display.
+
+        A frame drawn on a screen smaller than the window is scaled into it
+        first, unless it is there already (in_window). The overlay is drawn
+        last, on the window itself, so it is never scaled.
+        """
+        if self.screen is not self.window:
+            if not in_window:
+                pygame.transform.scale(self.screen, self.window.get_size(), self.window)
+            rects = None
+
+        if self.overlay and self.overlay.visible and not self.in_menu:
+            self.overlay.render(self.window)
+
+        if rects is None:
+            pygame.display.flip()
         else:
-            self.world.render(self.screen)
-            self.player.render(self.screen)
-            # Render UI elements
+            pygame.display.update(rects)
+
+    def render_dirty(self):
+        world = self.world
+        drawables = world.get_drawables()
+
+        # Terrain cells that changed since the last frame (None if the layer was rebuilt)
+        dirty_rects = world.update_terrain_layer()
+
+        # Entity rects are in world coordinates; shift them to the screen
+        camera = world.camera
+        offset_x, offset_y = offset = camera.offset()
+
+        # Scrolling or zooming changes the whole picture, and a scaled view is always redrawn whole
+        camera_state = (offset, camera.zoom)
+        if camera_state != self.last_camera or camera.zoom != 1 or camera.pixel_scale != 1:
+            self.last_camera = camera_state
+            self.full_redraw = True
+
+        if self.full_redraw or dirty_rects is None:
+            world.render(self.screen, self.window)
+            self.render_states = {obj: (obj.get_rect().move(-offset_x, -offset_y), obj.get_render_state())
+                                  for obj in drawables}
+            self.full_redraw = False
+            self.present(in_window=True)
+            return
+
+        # Entities that appeared, moved, animated or changed state
+        previous_states = self.render_states
+        self.render_states = {}
+        for obj in drawables:
+            rect = obj.get_rect().move(-offset_x, -offset_y)
+            state = obj.get_render_state()
+            self.render_states[obj] = (rect, state)
+
+            previous = previous_states.pop(obj, None)
+            if previous is None:
+                dirty_rects.append(rect)
+            elif previous[0] != rect or previous[1] != state:
+                if previous[0].colliderect(rect):
+                    dirty_rects.append(previous[0].union(rect))
+                else:
+                    dirty_rects.append(previous[0])
+                    dirty_rects.append(rect)
+
+        # Entities that were removed (e.g. felled trees)
+        for rect, _ in previous_states.values():
+            dirty_rects.append(rect)
+
+        # The overlay changes every frame
+        if self.overlay.visible:
+            dirty_rects.append(self.overlay.get_rect())
+
+        if not dirty_rects:
+            return
+
+        # Restore the terrain under each dirty rect and redraw whatever overlaps it, in depth order
+        draw_rects = [self.render_states[obj][0] for obj in drawables]
+        for rect in dirty_rects:
+            self.screen.set_clip(rect)
+            world.restore_terrain(self.screen, rect)
+            for index in rect.collidelistall(draw_rects):
+                drawables[index].render(self.screen, offset)
+        self.screen.set_clip(None)
 
-        pygame.display.flip()
+        self.present(dirty_rects)
+
+    def step(self, ticks=1):
+        """Advance the simulation by a number of fixed ticks, as fast as the CPU allows."""
+        for _ in range(ticks):
+            self.update(self.dt)
+
+    def fast_forward(self, seconds):
+        """Advance the simulation by an amount of game time, in seconds."""
+        self.step(int(round(seconds * self.tick_rate)))
+
+    def run_headless(self, ticks=None):
+        """Simulate without rendering, for the given number of ticks or until interrupted."""
+        print("Starting headless simulation...")
+        start = time.perf_counter()
+        done = 0
+        try:
+            while self.running and (ticks is None or done < ticks):
+                batch = 1000 if ticks is None else min(1000, ticks - done)
+                self.step(batch)
+                done += batch
+        except KeyboardInterrupt:
+            pass
+
+        elapsed = time.perf_counter() - start
+        print(f"Simulated {done} ticks ({done * self.dt:.1f} s of game time) in {elapsed:.2f} s")
+        self.close()
+        pygame.quit()
 
     def run(self):
         print("Starting game...")
+        played = False
+        self.clock.tick()
         while self.running:
             self.handle_events()
-            self.update()
+
+            # Run as many fixed ticks as real time has passed; a slow machine renders
+            # fewer frames but the simulation keeps its speed
+            frame_time = min(self.clock.tick(self.FPS) / 1000.0, MAX_FRAME_TIME)
+            self.accumulator += frame_time
+            while self.accumulator >= self.dt:
+                self.update(self.dt)
+                self.accumulator -= self.dt
+
+            # Draw moving entities between their last two tick positions
+            self.alpha = self.accumulator / self.dt
             self.render()
-            self.clock.tick(self.FPS)
 
+            if self.first_frame_time is None:
+                self.first_frame_time = time.perf_counter() - self.start_time
+                print(f"Time to first frame: {self.first_frame_time * 1000:.1f} ms")
+
+            # Keep building the world while the menu is shown
+            if self.loader is not None:
+                self.advance_loading()
+
+            # Work time of the frame, without the sleep that caps the frame rate
+            if self.overlay and self.overlay.visible:
+                self.overlay.end_frame(self.clock.get_rawtime() / 1000.0)
+
+            if not self.in_menu:
+                played = True
+                self.autosaver.tick()
+
+        # Save on exit (unless the game never left the menu)
+        if self.autosaver:
+            if played:
+                self.autosaver.save(wait=True)
+            self.autosaver.stop()
+
+        self.close()
         pygame.quit()
         sys.exit()
 
+    def close(self):
+        # Remove the session's temporary files once nothing needs them any more
+        if self.world is not None:
+            self.world.close()
+
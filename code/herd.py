@@ -0,0 +1,133 @@
+import numpy as np
+
+# Direction codes used by the herd arrays
+DIRECTIONS = ["down", "up", "left", "right"]
+DIRECTION_CODES = {name: code for code, name in enumerate(DIRECTIONS)}
+DIRECTION_DX = np.array([0, 0, -1, 1], dtype=np.float64)
+DIRECTION_DY = np.array([1, -1, 0, 0], dtype=np.float64)
+
+
+class Herd:
+    """Wandering state of many animals held in arrays and advanced in one vectorized step.
+
+    Positions, direction codes, timers, cooldowns and speeds live in NumPy
+    columns; random draws for all animals changing state are batched per tick.
+    Each row has a view object (a HerdAnimal) that the game renders.
+    """
+
+    growth_rate = 0.06  # Growth per second for baby animals
+    animation_speed = 6  # Frames per second
+
+    def __init__(self, bounds, capacity=64, seed=None):
+        self.bounds = bounds  # (width, height) animals are kept inside
+        self.count = 0
+        self.capacity = capacity
+        self.rng = np.random.default_rng(seed)
+
+        self.x = np.zeros(capacity, dtype=np.float64)
+        self.y = np.zeros(capacity, dtype=np.float64)
+        self.prev_x = np.zeros(capacity, dtype=np.float64)
+        self.prev_y = np.zeros(capacity, dtype=np.float64)
+        self.width = np.zeros(capacity, dtype=np.int32)
+        self.height = np.zeros(capacity, dtype=np.int32)
+        self.speed = np.zeros(capacity, dtype=np.float64)
+        self.direction = np.zeros(capacity, dtype=np.uint8)
+        self.moving = np.zeros(capacity, dtype=bool)
+        self.move_timer = np.zeros(capacity, dtype=np.float64)
+        self.move_cooldown = np.zeros(capacity, dtype=np.float64)
+        self.move_duration = np.zeros(capacity, dtype=np.float64)
+        self.frame = np.zeros(capacity, dtype=np.int32)
+        self.animation_timer = np.zeros(capacity, dtype=np.float64)
+        self.move_frames = np.ones(capacity, dtype=np.int32)  # Frames in the walking animations
+        self.is_baby = np.zeros(capacity, dtype=bool)
+        self.age = np.zeros(capacity, dtype=np.float64)
+        self.depth = np.zeros(capacity, dtype=np.int64)  # Draw-order key last used for each animal
+
+        # View object of each row, in row order
+        self.views = []
+
+    def columns(self):
+        return ("x", "y", "prev_x", "prev_y", "width", "height", "speed", "direction", "moving", "move_timer",
+                "move_cooldown", "move_duration", "frame", "animation_timer", "move_frames",
+                "is_baby", "age", "depth")
+
+    def grow_capacity(self):
+        self.capacity *= 2
+        for name in self.columns():
+            column = getattr(self, name)
+            grown = np.zeros(self.capacity, dtype=column.dtype)
+            grown[:self.count] = column[:self.count]
+            setattr(self, name, grown)
+
+    def add(self, view):
+        """Reserve a row for an animal; the view fills it in through its properties."""
+        if self.count == self.capacity:
+            self.grow_capacity()
+
+        index = self.count
+        for name in self.columns():
+            getattr(self, name)[index] = 0
+        self.move_frames[index] = 1
+
+        self.count += 1
+        self.views.append(view)
+        return index
+
+    def step(self, dt):
+        """Advance every animal by one tick of dt seconds."""
+        n = self.count
+        if n == 0:
+            return
+
+        x = self.x[:n]
+        y = self.y[:n]
+        self.prev_x[:n] = x
+        self.prev_y[:n] = y
+        speed = self.speed[:n]
+        direction = self.direction[:n]
+        moving = self.moving[:n]
+        move_timer = self.move_timer[:n]
+
+        # Handle growth for baby animals (rare, so the views handle the switch)
+        babies = self.is_baby[:n]
+        self.age[:n][babies] += self.growth_rate * dt
+        for index in np.flatnonzero(babies & (self.age[:n] >= 1.0)):
+            self.views[index].grow_up()
+
+        # Handle movement
+        move_timer += dt
+
+        stopping = moving & (move_timer >= self.move_duration[:n])
+        walking = moving & ~stopping
+        starting = ~moving & (move_timer >= self.move_cooldown[:n])
+
+        # Move in the current direction and keep animals on screen
+        codes = direction[walking]
+        step = speed[walking] * dt
+        x[walking] = np.clip(x[walking] + DIRECTION_DX[codes] * step,
+                             0, self.bounds[0] - self.width[:n][walking])
+        y[walking] = np.clip(y[walking] + DIRECTION_DY[codes] * step,
+                             0, self.bounds[1] - self.height[:n][walking])
+
+        # State transitions, with one batch of random draws per kind
+        stop_count = np.count_nonzero(stopping)
+        if stop_count:
+            moving[stopping] = False
+            move_timer[stopping] = 0
+            self.move_cooldown[:n][stopping] = self.rng.uniform(1.0, 3.0, stop_count)
+
+        start_count = np.count_nonzero(starting)
+        if start_count:
+            moving[starting] = True
+            move_timer[starting] = 0
+            self.move_duration[:n][starting] = self.rng.uniform(0.5, 2.0, start_count)
+            direction[starting] = self.rng.integers(0, len(DIRECTIONS), start_count)
+
+        # Update animation (idle animations have a single frame)
+        animation_timer = self.animation_timer[:n]
+        animation_timer += self.animation_speed * dt
+        advance = animation_timer >= 1
+        animation_timer[advance] = 0
+        frame_count = np.where(moving, self.move_frames[:n], 1)
+        self.frame[:n][advance] = (self.frame[:n][advance] + 1) % frame_count[advance]
+
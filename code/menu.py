@@ -1,5 +1,8 @@
 import pygame
 import os
+from .settings import SAVE_PATH
+from .text import text_cache
+from .assets import asset_cache
 
 
 class Menu:
@@ -10,6 +13,8 @@ class Menu:
 
         # Menu options
         self.options = ["Start Game", "Options", "Exit"]
+        if os.path.exists(SAVE_PATH):
+            self.options.insert(1, "Load Game")
         self.selected_option = 0
 
         # Font
@@ -28,9 +33,9 @@ class Menu:
 
         # Try to load background image
         try:
-            self.background_image = pygame.image.load("assets/images/ui/menu_background.png").convert()
-            # Scale the image to fit the screen if needed
-            self.background_image = pygame.transform.scale(self.background_image, (self.width, self.height))
+            # Scaled to fit the screen (through the asset cache, so it can come from the bake)
+            self.background_image = asset_cache.frame("assets/images/ui/menu_background.png",
+                                                      size=(self.width, self.height)).convert()
         except (pygame.error, FileNotFoundError):
             print("Não foi possível carregar a imagem de fundo do menu.")
             self.background_image = None
@@ -57,18 +62,33 @@ class Menu:
 
     def select_option(self):
         if self.options[self.selected_option] == "Start Game":
+            # Only waits if the world is still being built
+            self.game.finish_loading()
             self.game.in_menu = False
             # pygame.mixer.music.stop()  # Stop menu music
+        elif self.options[self.selected_option] == "Load Game":
+            if self.game.load_game():
+                self.game.in_menu = False
         elif self.options[self.selected_option] == "Options":
             # Options menu would go here
             pass
         elif self.options[self.selected_option] == "Exit":
             self.game.running = False
 
-    def update(self):
+    def update(self, dt):
         # Menu animations or effects would go here
         pass
 
+    def render_loading(self, screen, progress):
+        # Progress bar at the bottom of the menu while the world is being built
+        bar = pygame.Rect(0, 0, self.width // 2, 16)
+        bar.center = (self.width // 2, self.height - 40)
+        pygame.draw.rect(screen, (0, 0, 0), bar)
+        filled = bar.inflate(-4, -4)
+        filled.width = int(filled.width * progress)
+        pygame.draw.rect(screen, self.title_color, filled)
+        pygame.draw.rect(screen, self.option_color, bar, 1)
+
     def render(self, screen):
         # Draw background
         if self.background_image:
@@ -77,16 +97,20 @@ class Menu:
             screen.blit(self.background, (0, 0))
 
         # Draw title
-        title_text = self.title_font.render("Pixel Farm", True, self.title_color)
+        title_text = text_cache.render(self.title_font, "Pixel Farm", self.title_color)
         title_rect = title_text.get_rect(center=(self.width // 2, self.height // 4))
         screen.blit(title_text, title_rect)
 
         # Draw options
         for i, option in enumerate(self.options):
             color = self.selected_color if i == self.selected_option else self.option_color
-            option_text = self.option_font.render(option, True, color)
+            option_text = text_cache.render(self.option_font, option, color)
             option_rect = option_text.get_rect(
                 center=(self.width // 2, self.height // 2 + i * 50)
             )
             screen.blit(option_text, option_rect)
 
+        # Show how far the world is while it is still being built
+        if self.game.loading():
+            self.render_loading(screen, self.game.loading_progress)
+
@@ -1,6 +1,7 @@
 import pygame
 import os
 import random
+from .assets import asset_cache
 
 class NPC:
     def __init__(self, x, y, sprite_name, frame_count, width=30, height=30):
@@ -11,36 +12,51 @@ class NPC:
         """
 
         sprite_path = os.path.join("assets", "sprites", "chicken_baby_sprites", "chicken1.png")
-        self.spritesheet = pygame.image.load(sprite_path).convert_alpha()
+        self.sprite_path = sprite_path
+        self.spritesheet = asset_cache.load_image(sprite_path)
         self.frames = self.load_frames(7, 30, 30)
         self.index = 0
         self.image = self.frames[self.index]
         self.rect = self.image.get_rect(topleft=(x, y))
 
+        # Float position; rect is derived from it, so sub-pixel steps accumulate
+        self.x = float(x)
+        self.y = float(y)
+
         # Movimento
-        self.speed = 1
+        self.speed = 60  # Pixels per second
         self.direction = pygame.Vector2(random.choice([-1, 0, 1]), random.choice([-1, 0, 1]))
         self.move_timer = 0
+        self.turn_interval = 80 / 60  # Seconds between direction changes
+
+        # Animação
+        self.animation_speed = 60  # Frames por segundo
+        self.animation_timer = 0
 
     def load_frames(self, frame_count, width, height):
         """Corta os sprites corretamente com base no número de frames."""
         frames = []
         for i in range(frame_count):  # Percorre a quantidade de frames
-            frame = self.spritesheet.subsurface((i * width, 0, width, height))
+            frame = asset_cache.frame(self.sprite_path, (i * width, 0, width, height))
             frames.append(frame)
         return frames
 
-    def update(self):
+    def update(self, dt):
         """Atualiza a movimentação e animação da galinha/ovelha."""
-        self.move_timer += 1
-        if self.move_timer > 80:  # Muda de direção a cada 80 frames (~2.6s a 30 FPS)
+        self.move_timer += dt
+        if self.move_timer > self.turn_interval:  # Muda de direção a cada 80 ticks
             self.direction = pygame.Vector2(random.choice([-1, 0, 1]), random.choice([-1, 0, 1]))
             self.move_timer = 0
 
         # Movimentar NPC
-        self.rect.x += self.direction.x * self.speed
-        self.rect.y += self.direction.y * self.speed
+        self.x += self.direction.x * self.speed * dt
+        self.y += self.direction.y * self.speed * dt
+        self.rect.x = int(self.x)
+        self.rect.y = int(self.y)
 
         # Atualizar animação
-        self.index = (self.index + 1) % len(self.frames)
+        self.animation_timer += self.animation_speed * dt
+        while self.animation_timer >= 1:
+            self.animation_timer -= 1
+            self.index = (self.index + 1) % len(self.frames)
         self.image = self.frames[self.index]
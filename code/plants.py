@@ -2,10 +2,18 @@ import pygame
 import random
 import os
 from .sprite_sheet import SpriteSheet
+from .assets import asset_cache
+from .blitting import render_blits
+from .atlas import atlas
+from .spatial import SpatialHash
+from .crops import CropField
+from .scheduler import EventQueue
 
 
 class Plant:
-    def __init__(self, game, x, y, plant_type):
+    """A crop, stored as one row of a CropField; this object is a thin view for rendering and tools."""
+
+    def __init__(self, game, x, y, plant_type, field=None, index=None):
         self.game = game
         self.x = x
         self.y = y
@@ -13,21 +21,53 @@ class Plant:
         self.width = 32
         self.height = 32
 
-        # Growth stages
-        self.growth_stage = 0  # 0: seed, 1: sprout, 2: growing, 3: mature
-        self.max_growth_stage = 3
-        self.growth_timer = 0
-        self.growth_rate = 0.005  # How fast the plant grows
-
-        # Watering
-        self.watered = False
-        self.water_level = 0
-        self.water_drain_rate = 0.001
+        # Growth and watering state lives in the field's columns
+        # Growth stages: 0: seed, 1: sprout, 2: growing, 3: mature
+        self.field = field if field is not None else CropField()
+        self.max_growth_stage = self.field.max_growth_stage
+        if index is None:
+            self.index = self.field.add(x, y, plant_type, self)
+        else:
+            # The row already exists (e.g. loaded from a save)
+            self.index = index
+            self.field.views[index] = self
 
         # Load sprites
         self.load_sprites()
 
+    @property
+    def growth_stage(self):
+        return int(self.field.stage[self.index])
+
+    @growth_stage.setter
+    def growth_stage(self, value):
+        self.field.set_stage(self.index, value)
+
+    @property
+    def growth_timer(self):
+        return self.field.growth_timer(self.index)
+
+    @property
+    def watered(self):
+        return self.field.is_watered(self.index)
+
+    @property
+    def water_level(self):
+        return self.field.water_level(self.index)
+
     def load_sprites(self):
+        # Stage sprites are built once per plant type and pixel scale and shared by every plant
+        scale = self.game.pixel_scale
+        self.stage_sprites = atlas.sprite_set(f"plants/{self.plant_type}/{scale}",
+                                              lambda: self.build_stage_sprites(scale))
+
+    def build_stage_sprites(self, scale=1):
+        # Sprites are 1 / scale of the plant's size (the art's own size at native resolution)
+        width, height = self.width // scale, self.height // scale
+
+        # Create placeholder for growth stage sprites
+        stage_sprites = [pygame.Surface((width, height), pygame.SRCALPHA) for _ in range(4)]
+
         try:
             # Make sure the directory exists
             os.makedirs("assets/images/items", exist_ok=True)
@@ -39,41 +79,38 @@ class Plant:
             frame_width = 16
             frame_height = 16
 
-            # Create placeholder for growth stage sprites
-            self.stage_sprites = [pygame.Surface((self.width, self.height), pygame.SRCALPHA) for _ in range(4)]
-
             # Extract crop sprites based on plant type
             # The item sheet has different crops at different positions
             if self.plant_type == "wheat":
                 # Use the wheat/grain sprite from the item sheet
-                crop_sprite = item_sheet.image_at((frame_width * 2, 0, frame_width, frame_height))
-                crop_sprite = pygame.transform.scale(crop_sprite, (self.width, self.height))
+                crop_rect = (frame_width * 2, 0, frame_width, frame_height)
             elif self.plant_type == "carrot":
                 # Use the carrot sprite from the item sheet
-                crop_sprite = item_sheet.image_at((frame_width * 3, 0, frame_width, frame_height))
-                crop_sprite = pygame.transform.scale(crop_sprite, (self.width, self.height))
+                crop_rect = (frame_width * 3, 0, frame_width, frame_height)
             else:
                 # Default crop sprite
-                crop_sprite = item_sheet.image_at((frame_width * 2, 0, frame_width, frame_height))
-                crop_sprite = pygame.transform.scale(crop_sprite, (self.width, self.height))
+                crop_rect = (frame_width * 2, 0, frame_width, frame_height)
+            crop_sprite = item_sheet.image_at(crop_rect, size=(width, height))
 
-            # Create growth stage sprites
+            # Create growth stage sprites (shapes measured in world pixels)
             # Stage 0: Small dirt mound
-            self.stage_sprites[0].fill((139, 69, 19, 100))  # Semi-transparent brown
-            pygame.draw.circle(self.stage_sprites[0], (101, 67, 33), (self.width // 2, self.height // 2), 5)
+            stage_sprites[0].fill((139, 69, 19, 100))  # Semi-transparent brown
+            pygame.draw.circle(stage_sprites[0], (101, 67, 33), (width // 2, height // 2), 5 // scale)
 
             # Stage 1: Small sprout
-            self.stage_sprites[1].fill((0, 0, 0, 0))  # Transparent
-            pygame.draw.rect(self.stage_sprites[1], (101, 67, 33), (self.width // 2 - 2, self.height // 2, 4, 8))
-            pygame.draw.circle(self.stage_sprites[1], (50, 205, 50), (self.width // 2, self.height // 2 - 2), 3)
+            stage_sprites[1].fill((0, 0, 0, 0))  # Transparent
+            pygame.draw.rect(stage_sprites[1], (101, 67, 33),
+                             (width // 2 - 2 // scale, height // 2, 4 // scale, 8 // scale))
+            pygame.draw.circle(stage_sprites[1], (50, 205, 50), (width // 2, height // 2 - 2 // scale), 3 // scale)
 
             # Stage 2: Growing plant
-            self.stage_sprites[2].fill((0, 0, 0, 0))  # Transparent
-            pygame.draw.rect(self.stage_sprites[2], (101, 67, 33), (self.width // 2 - 2, self.height // 2, 4, 12))
-            pygame.draw.circle(self.stage_sprites[2], (34, 139, 34), (self.width // 2, self.height // 2 - 6), 6)
+            stage_sprites[2].fill((0, 0, 0, 0))  # Transparent
+            pygame.draw.rect(stage_sprites[2], (101, 67, 33),
+                             (width // 2 - 2 // scale, height // 2, 4 // scale, 12 // scale))
+            pygame.draw.circle(stage_sprites[2], (34, 139, 34), (width // 2, height // 2 - 6 // scale), 6 // scale)
 
             # Stage 3: Mature crop (use the crop sprite)
-            self.stage_sprites[3] = crop_sprite
+            stage_sprites[3] = crop_sprite
 
             print(f"Loaded sprites for {self.plant_type}")
 
@@ -89,40 +126,37 @@ class Plant:
             else:
                 colors = [(100, 100, 100), (150, 150, 150), (200, 200, 200), (250, 250, 250)]
 
-            for i, surf in enumerate(self.stage_sprites):
+            stage_sprites = [pygame.Surface((width, height), pygame.SRCALPHA) for _ in range(4)]
+            for i, surf in enumerate(stage_sprites):
                 surf.fill(colors[i])
 
-    def water(self):
-        self.watered = True
-        self.water_level = 1.0
+        return stage_sprites
 
-    def update(self):
-        # Handle watering effect
-        if self.watered:
-            self.water_level -= self.water_drain_rate
-            if self.water_level <= 0:
-                self.watered = False
-                self.water_level = 0
+    def water(self):
+        self.field.water(self.index)
 
-        # Handle growth
-        if self.growth_stage < self.max_growth_stage:
-            growth_multiplier = 2.0 if self.watered else 1.0
-            self.growth_timer += self.growth_rate * growth_multiplier
+    def get_rect(self):
+        # Screen area covered by the plant, including the water indicator
+        return pygame.Rect(self.x, self.y, self.width, self.height + 7)
 
-            if self.growth_timer >= 1:
-                self.growth_timer = 0
-                self.growth_stage += 1
+    def get_render_state(self):
+        return self.growth_stage, self.watered
 
-    def render(self, screen):
-        # Draw plant at current growth stage
+    def add_blits(self, draw_list, offset=(0, 0), scale=1):
+        # Plant at current growth stage (offset is the camera position), in view pixels
+        # of scale world pixels
+        x = (self.x - offset[0]) // scale
+        y = (self.y - offset[1]) // scale
         current_sprite = self.stage_sprites[min(self.growth_stage, len(self.stage_sprites) - 1)]
-        screen.blit(current_sprite, (self.x, self.y))
+        draw_list.append((current_sprite, (x, y)))
 
-        # Draw water indicator if watered
+        # Water indicator if watered (one surface shared by every plant)
         if self.watered:
-            water_indicator = pygame.Surface((self.width, 5))
-            water_indicator.fill((0, 0, 255))
-            screen.blit(water_indicator, (self.x, self.y + self.height + 2))
+            draw_list.append((asset_cache.solid((self.width // scale, 5 // scale), (0, 0, 255)),
+                              (x, y + (self.height + 2) // scale)))
+
+    def render(self, screen, offset=(0, 0)):
+        render_blits(self, screen, offset)
 
 
 class Tree:
@@ -136,8 +170,7 @@ class Tree:
         # Growth stages
         self.growth_stage = random.randint(0, 3)  # 0: sapling, 1: young, 2: growing, 3: mature
         self.max_growth_stage = 3
-        self.growth_timer = 0
-        self.growth_rate = 0.002  # Trees grow slower than plants
+        self.growth_rate = 0.12  # Growth per second; trees grow slower than plants
 
         # Tree state
         self.health = 100
@@ -148,20 +181,27 @@ class Tree:
         self.load_sprites()
 
     def load_sprites(self):
+        # Stage sprites are shared by every tree drawn at the same pixel scale
+        scale = self.game.pixel_scale
+        self.stage_sprites = atlas.sprite_set(f"trees/{scale}", lambda: self.build_stage_sprites(scale))
+
+    def build_stage_sprites(self, scale=1):
+        # Stage sizes in world pixels; sprites are 1 / scale of them
+        sizes = [(width // scale, height // scale) for width, height in [(32, 48), (48, 64), (56, 80), (64, 96)]]
         try:
             # Make sure the directory exists
             os.makedirs("assets/images/trees", exist_ok=True)
 
             # Load tree sprites
-            small_tree = pygame.image.load("assets/images/trees/Oak_Tree_Small.png").convert_alpha()
-            large_tree = pygame.image.load("assets/images/trees/Oak_Tree.png").convert_alpha()
+            small_tree = "assets/images/trees/Oak_Tree_Small.png"
+            large_tree = "assets/images/trees/Oak_Tree.png"
 
             # Create sprites for different growth stages
-            self.stage_sprites = [
-                pygame.transform.scale(small_tree, (32, 48)),  # Sapling (smallest)
-                pygame.transform.scale(small_tree, (48, 64)),  # Young (small)
-                pygame.transform.scale(large_tree, (56, 80)),  # Growing (medium)
-                pygame.transform.scale(large_tree, (64, 96))  # Mature (full size)
+            stage_sprites = [
+                asset_cache.frame(small_tree, size=sizes[0]),  # Sapling (smallest)
+                asset_cache.frame(small_tree, size=sizes[1]),  # Young (small)
+                asset_cache.frame(large_tree, size=sizes[2]),  # Growing (medium)
+                asset_cache.frame(large_tree, size=sizes[3])  # Mature (full size)
             ]
 
             print("Tree sprites loaded successfully!")
@@ -169,17 +209,17 @@ class Tree:
         except Exception as e:
             print(f"Error loading tree sprites: {e}")
             # Create simple tree sprites as fallback
-            self.stage_sprites = [
-                pygame.Surface((32, 48), pygame.SRCALPHA),  # Sapling
-                pygame.Surface((48, 64), pygame.SRCALPHA),  # Young
-                pygame.Surface((56, 80), pygame.SRCALPHA),  # Growing
-                pygame.Surface((64, 96), pygame.SRCALPHA)  # Mature
+            stage_sprites = [
+                pygame.Surface(sizes[0], pygame.SRCALPHA),  # Sapling
+                pygame.Surface(sizes[1], pygame.SRCALPHA),  # Young
+                pygame.Surface(sizes[2], pygame.SRCALPHA),  # Growing
+                pygame.Surface(sizes[3], pygame.SRCALPHA)  # Mature
             ]
 
             # Draw simple tree shapes
-            for i, surf in enumerate(self.stage_sprites):
+            for i, surf in enumerate(stage_sprites):
                 # Draw trunk
-                trunk_width = max(4, int(surf.get_width() * 0.2))
+                trunk_width = max(4 // scale, int(surf.get_width() * 0.2))
                 trunk_height = int(surf.get_height() * 0.6)
                 trunk_x = (surf.get_width() - trunk_width) // 2
                 trunk_y = surf.get_height() - trunk_height
@@ -193,46 +233,74 @@ class Tree:
 
                 pygame.draw.circle(surf, (34, 139, 34), (foliage_x, foliage_y), foliage_radius)
 
+        return stage_sprites
+
     def cut(self):
         if self.growth_stage == self.max_growth_stage:  # Only mature trees can be cut
             self.cut_progress += 1
             return self.cut_progress >= self.cut_threshold
         return False
 
-    def update(self):
-        # Handle growth
+    def grow(self):
+        # Advance one growth stage; returns whether the tree keeps growing
         if self.growth_stage < self.max_growth_stage:
-            self.growth_timer += self.growth_rate
+            self.growth_stage += 1
+        return self.growth_stage < self.max_growth_stage
 
-            if self.growth_timer >= 1:
-                self.growth_timer = 0
-                self.growth_stage += 1
+    def get_rect(self):
+        # Screen area covered by the tree, including the cut progress bar
+        return pygame.Rect(self.x, self.y, self.width, self.height + 10)
 
-    def render(self, screen):
-        # Draw tree at current growth stage
+    def get_render_state(self):
+        return self.growth_stage, self.cut_progress
+
+    def add_blits(self, draw_list, offset=(0, 0), scale=1):
+        # Tree at current growth stage (offset is the camera position), in view pixels
+        # of scale world pixels
+        x = (self.x - offset[0]) // scale
+        y = (self.y - offset[1]) // scale
         current_sprite = self.stage_sprites[min(self.growth_stage, len(self.stage_sprites) - 1)]
 
         # Calculate position to center the tree sprite
         sprite_width, sprite_height = current_sprite.get_size()
-        pos_x = self.x + (self.width - sprite_width) // 2
-        pos_y = self.y + (self.height - sprite_height)
+        pos_x = x + (self.width // scale - sprite_width) // 2
+        pos_y = y + (self.height // scale - sprite_height)
 
-        screen.blit(current_sprite, (pos_x, pos_y))
+        draw_list.append((current_sprite, (pos_x, pos_y)))
 
-        # Draw cut progress if being cut
+        # Cut progress if being cut
         if self.cut_progress > 0 and self.growth_stage == self.max_growth_stage:
-            progress_width = (self.width * self.cut_progress) // self.cut_threshold
-            progress_bar = pygame.Surface((progress_width, 5))
-            progress_bar.fill((255, 0, 0))
-            screen.blit(progress_bar, (self.x, self.y + self.height + 5))
+            progress_width = (self.width * self.cut_progress) // self.cut_threshold // scale
+            draw_list.append((asset_cache.solid((progress_width, 5 // scale), (255, 0, 0)),
+                              (x, y + (self.height + 5) // scale)))
+
+    def render(self, screen, offset=(0, 0)):
+        render_blits(self, screen, offset)
 
 
 class PlantManager:
-    def __init__(self, game):
+    def __init__(self, game, render_queue):
         self.game = game
-        self.plants = []
         self.trees = []
 
+        # Draw order shared with the other entities of the world
+        self.render_queue = render_queue
+
+        # Crops are simulated column-wise; self.plants is the field's list of views
+        self.crops = CropField()
+        self.plants = self.crops.views
+
+        # Spatial indexes for placement checks and range queries
+        self.plant_index = SpatialHash(64)
+        self.tree_index = SpatialHash(64)
+
+        # Position of each tree in its list, so removal is O(1)
+        self.tree_slots = {}
+
+        # Game time in seconds; trees grow through scheduled events
+        self.time = 0.0
+        self.tree_events = EventQueue()
+
         # We'll spawn trees later, not during initialization
         # This avoids the circular dependency
 
@@ -254,7 +322,7 @@ class PlantManager:
 
                 if (0 <= grid_x < world.grid_width and
                         0 <= grid_y < world.grid_height and
-                        world.grid[grid_x][grid_y] == 0):
+                        world.get_tile(grid_x, grid_y) == 0):
 
                     # Check if it's not too close to the house
                     house_center_x = world.house_pos[0] + 64
@@ -262,71 +330,137 @@ class PlantManager:
 
                     if ((x - house_center_x) ** 2 + (y - house_center_y) ** 2) > 150 ** 2:
                         # Not too close to the house, add the tree
-                        self.trees.append(Tree(self.game, x, y))
+                        self.add_tree(Tree(self.game, x, y))
                         break
 
                 attempts += 1
 
-    def plant_seed(self, x, y, plant_type):
+    def add_plant(self, plant):
+        # The plant already has a row in the field (and so a place in self.plants)
+        self.plant_index.insert(plant, plant.get_rect())
+        self.render_queue.add(plant)
+
+    def add_tree(self, tree, next_growth=None):
+        self.tree_slots[tree] = len(self.trees)
+        self.trees.append(tree)
+        self.tree_index.insert(tree, tree.get_rect())
+        self.render_queue.add(tree)
+        if next_growth is None:
+            self.schedule_tree_growth(tree, self.time)
+        elif tree.growth_stage < tree.max_growth_stage:
+            self.tree_events.schedule(next_growth, tree)
+
+    def load_plants(self, records, type_names):
+        # Saved crops go into the field in bulk; each row then gets its view
+        start = self.crops.load_rows(records, type_names)
+        for offset, (x, y, type_index) in enumerate(zip(records["x"].tolist(), records["y"].tolist(),
+                                                        records["type"].tolist())):
+            self.add_plant(Plant(self.game, x, y, type_names[type_index], self.crops, start + offset))
+
+    def tree_growth_times(self):
+        # Game time of the next growth of each growing tree
+        return {tree: time for time, _, tree, _ in self.tree_events.heap if tree in self.tree_slots}
+
+    def clear(self):
+        # Remove every plant and tree
+        for obj in self.plants + self.trees:
+            self.render_queue.remove(obj)
+
+        self.trees = []
+        self.tree_slots = {}
+        self.crops = CropField()
+        self.crops.now = self.time
+        self.plants = self.crops.views
+        self.plant_index = SpatialHash(64)
+        self.tree_index = SpatialHash(64)
+        self.tree_events = EventQueue()
+
+    def schedule_tree_growth(self, tree, time):
+        if tree.growth_stage < tree.max_growth_stage:
+            self.tree_events.schedule(time + 1.0 / tree.growth_rate, tree)
+
+    def remove_plant(self, plant):
+        self.crops.remove(plant.index)
+        self.plant_index.remove(plant)
+        self.render_queue.remove(plant)
+
+    def remove_tree(self, tree):
+        # Move the last tree into the freed slot; draw order comes from the render queue
+        index = self.tree_slots.pop(tree)
+        last = self.trees.pop()
+        if last is not tree:
+            self.trees[index] = last
+            self.tree_slots[last] = index
+        self.tree_index.remove(tree)
+        self.render_queue.remove(tree)
+
+    def plants_near(self, x, y, distance=32):
+        # Plants whose position is less than distance away on both axes
+        window = pygame.Rect(x - distance + 1, y - distance + 1, 2 * distance - 1, 2 * distance - 1)
+        return [plant for plant in self.plant_index.query_rect(window)
+                if abs(plant.x - x) < distance and abs(plant.y - y) < distance]
+
+    def trees_near(self, x, y, distance=64):
+        # Trees whose position is less than distance away on both axes
+        window = pygame.Rect(x - distance + 1, y - distance + 1, 2 * distance - 1, 2 * distance - 1)
+        return [tree for tree in self.tree_index.query_rect(window)
+                if abs(tree.x - x) < distance and abs(tree.y - y) < distance]
+
+    def plants_in_rect(self, rect):
+        return self.plant_index.query_rect(rect)
+
+    def trees_in_rect(self, rect):
+        return self.tree_index.query_rect(rect)
+
+    def is_occupied(self, x, y):
         # Check if there's already a plant or tree at this location
-        for plant in self.plants:
-            if abs(plant.x - x) < 32 and abs(plant.y - y) < 32:
-                return False
+        return bool(self.plants_near(x, y)) or bool(self.trees_near(x, y))
 
-        for tree in self.trees:
-            if abs(tree.x - x) < 64 and abs(tree.y - y) < 64:
-                return False
+    def closest(self, objects, x, y):
+        return min(objects, key=lambda obj: (obj.x - x) ** 2 + (obj.y - y) ** 2)
+
+    def plant_seed(self, x, y, plant_type):
+        if self.is_occupied(x, y):
+            return False
 
         # Plant a new seed
-        self.plants.append(Plant(self.game, x, y, plant_type))
+        self.add_plant(Plant(self.game, x, y, plant_type, self.crops))
         return True
 
     def plant_tree(self, x, y):
-        # Check if there's already a plant or tree at this location
-        for plant in self.plants:
-            if abs(plant.x - x) < 32 and abs(plant.y - y) < 32:
-                return False
-
-        for tree in self.trees:
-            if abs(tree.x - x) < 64 and abs(tree.y - y) < 64:
-                return False
+        if self.is_occupied(x, y):
+            return False
 
         # Plant a new tree
-        self.trees.append(Tree(self.game, x, y))
-        self.trees[-1].growth_stage = 0  # Start as a sapling
+        tree = Tree(self.game, x, y)
+        tree.growth_stage = 0  # Start as a sapling
+        self.add_tree(tree)
         return True
 
     def water_plant(self, x, y):
         # Find the closest plant to water
-        for plant in self.plants:
-            if abs(plant.x - x) < 32 and abs(plant.y - y) < 32:
-                plant.water()
-                return True
+        plants = self.plants_near(x, y)
+        if plants:
+            self.closest(plants, x, y).water()
+            return True
         return False
 
     def cut_tree(self, x, y):
         # Find the closest tree to cut
-        for i, tree in enumerate(self.trees):
-            if abs(tree.x - x) < 64 and abs(tree.y - y) < 64:
-                if tree.cut():
-                    # Tree has been fully cut, remove it
-                    self.trees.pop(i)
-                    return True
-                return False
+        trees = self.trees_near(x, y)
+        if trees:
+            tree = self.closest(trees, x, y)
+            if tree.cut():
+                # Tree has been fully cut, remove it
+                self.remove_tree(tree)
+                return True
         return False
 
-    def update(self):
-        for plant in self.plants:
-            plant.update()
-
-        for tree in self.trees:
-            tree.update()
-
-    def render(self, screen):
-        # Sort plants and trees by y-coordinate for proper depth
-        all_objects = [(obj, obj.y + obj.height) for obj in self.plants + self.trees]
-        sorted_objects = sorted(all_objects, key=lambda item: item[1])
-
-        for obj, _ in sorted_objects:
-            obj.render(screen)
+    def update(self, dt):
+        # Advance game time by one tick; only growth events that are due cost anything
+        self.time += dt
+        self.crops.advance(self.time)
 
+        for time, tree, _ in self.tree_events.pop_due(self.time):
+            if tree in self.tree_slots and tree.grow():
+                self.schedule_tree_growth(tree, time)
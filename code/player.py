@@ -1,6 +1,9 @@
 import pygame
 import os
 from .sprite_sheet import SpriteSheet
+from .assets import asset_cache
+from .blitting import render_blits
+from .atlas import atlas
 
 
 class Player:
@@ -10,7 +13,11 @@ class Player:
         self.y = y
         self.width = 32
         self.height = 32
-        self.speed = 3
+        self.speed = 180  # Pixels per second
+
+        # Position at the previous tick, for interpolated rendering
+        self.prev_x = x
+        self.prev_y = y
 
         # Movement
         self.moving = False
@@ -18,7 +25,7 @@ class Player:
 
         # Animation
         self.frame = 0
-        self.animation_speed = 0.15
+        self.animation_speed = 9  # Frames per second
         self.animation_timer = 0
 
         # Actions
@@ -31,17 +38,19 @@ class Player:
         # Debug
         self.debug = True
 
-        # Load sprites
-        self.load_sprites()
+        # Frames are loaded at the size they are drawn: the art's own size at native resolution
+        self.frame_size = (self.width // game.pixel_scale, self.height // game.pixel_scale)
 
-        # Load tool animations
-        self.load_tool_animations()
+        # Farmer and tool frames are drawn from the texture atlas, packed once per process
+        self.animations = atlas.sprite_set(f"farmer/{game.pixel_scale}", self.load_sprites)
+        self.tool_animations = atlas.sprite_set(f"tools/{game.pixel_scale}", self.load_tool_animations)
 
     def _create_colored_rect(self, color):
         # Helper method to create a colored rectangle with a border
-        surf = pygame.Surface((self.width, self.height), pygame.SRCALPHA)
-        pygame.draw.rect(surf, color, (0, 0, self.width, self.height))
-        pygame.draw.rect(surf, (0, 0, 0), (0, 0, self.width, self.height), 2)  # Black border
+        width, height = self.frame_size
+        surf = pygame.Surface((width, height), pygame.SRCALPHA)
+        pygame.draw.rect(surf, color, (0, 0, width, height))
+        pygame.draw.rect(surf, (0, 0, 0), (0, 0, width, height), max(1, 2 * width // self.width))  # Black border
         return surf
 
     def load_sprites(self):
@@ -60,19 +69,12 @@ class Player:
                 frame_width = 16
                 frame_height = 16
 
-                # Extract frames for each direction and scale them
-                down_frames = [pygame.transform.scale(frame, (self.width, self.height))
-                               for frame in farmer_sheet.load_strip((0, 0, frame_width, frame_height), 2)]
-
-                up_frames = [pygame.transform.scale(frame, (self.width, self.height))
-                             for frame in farmer_sheet.load_strip((frame_width * 2, 0, frame_width, frame_height), 2)]
-
-                left_frames = [pygame.transform.scale(frame, (self.width, self.height))
-                               for frame in farmer_sheet.load_strip((frame_width * 4, 0, frame_width, frame_height), 2)]
-
-                right_frames = [pygame.transform.scale(frame, (self.width, self.height))
-                                for frame in
-                                farmer_sheet.load_strip((frame_width * 6, 0, frame_width, frame_height), 2)]
+                # Extract frames for each direction, scaled to the player size
+                size = self.frame_size
+                down_frames = farmer_sheet.load_strip((0, 0, frame_width, frame_height), 2, size=size)
+                up_frames = farmer_sheet.load_strip((frame_width * 2, 0, frame_width, frame_height), 2, size=size)
+                left_frames = farmer_sheet.load_strip((frame_width * 4, 0, frame_width, frame_height), 2, size=size)
+                right_frames = farmer_sheet.load_strip((frame_width * 6, 0, frame_width, frame_height), 2, size=size)
 
                 # Store animations in dictionary
                 self.animations = {
@@ -104,6 +106,8 @@ class Player:
                 "right": [self._create_colored_rect((255, 0, 0)) for _ in range(2)]
             }
 
+        return self.animations
+
     def load_tool_animations(self):
         try:
             # Make sure the directory exists
@@ -122,83 +126,19 @@ class Player:
                 frame_width = 16
                 frame_height = 16
 
+                # Each tool has its own row in the sheet, with two frames per direction
+                tool_rows = {"axe": 0, "hoe": 1, "watering_can": 2}
+                direction_columns = {"right": 0, "up": 2, "left": 4, "down": 6}
+                size = self.frame_size
+
                 # Create a dictionary to store tool animations
-                self.tool_animations = {
-                    "axe": {
-                        "right": [pygame.transform.scale(tool_sheet.image_at((0, 0, frame_width, frame_height)),
-                                                         (self.width, self.height)),
-                                  pygame.transform.scale(
-                                      tool_sheet.image_at((frame_width, 0, frame_width, frame_height)),
-                                      (self.width, self.height))],
-                        "up": [
-                            pygame.transform.scale(tool_sheet.image_at((frame_width * 2, 0, frame_width, frame_height)),
-                                                   (self.width, self.height)),
-                            pygame.transform.scale(tool_sheet.image_at((frame_width * 3, 0, frame_width, frame_height)),
-                                                   (self.width, self.height))],
-                        "left": [
-                            pygame.transform.scale(tool_sheet.image_at((frame_width * 4, 0, frame_width, frame_height)),
-                                                   (self.width, self.height)),
-                            pygame.transform.scale(tool_sheet.image_at((frame_width * 5, 0, frame_width, frame_height)),
-                                                   (self.width, self.height))],
-                        "down": [
-                            pygame.transform.scale(tool_sheet.image_at((frame_width * 6, 0, frame_width, frame_height)),
-                                                   (self.width, self.height)),
-                            pygame.transform.scale(tool_sheet.image_at((frame_width * 7, 0, frame_width, frame_height)),
-                                                   (self.width, self.height))]
-                    },
-                    "hoe": {
-                        "right": [
-                            pygame.transform.scale(tool_sheet.image_at((0, frame_height, frame_width, frame_height)),
-                                                   (self.width, self.height)),
-                            pygame.transform.scale(
-                                tool_sheet.image_at((frame_width, frame_height, frame_width, frame_height)),
-                                (self.width, self.height))],
-                        "up": [pygame.transform.scale(
-                            tool_sheet.image_at((frame_width * 2, frame_height, frame_width, frame_height)),
-                            (self.width, self.height)),
-                               pygame.transform.scale(
-                                   tool_sheet.image_at((frame_width * 3, frame_height, frame_width, frame_height)),
-                                   (self.width, self.height))],
-                        "left": [pygame.transform.scale(
-                            tool_sheet.image_at((frame_width * 4, frame_height, frame_width, frame_height)),
-                            (self.width, self.height)),
-                                 pygame.transform.scale(
-                                     tool_sheet.image_at((frame_width * 5, frame_height, frame_width, frame_height)),
-                                     (self.width, self.height))],
-                        "down": [pygame.transform.scale(
-                            tool_sheet.image_at((frame_width * 6, frame_height, frame_width, frame_height)),
-                            (self.width, self.height)),
-                                 pygame.transform.scale(
-                                     tool_sheet.image_at((frame_width * 7, frame_height, frame_width, frame_height)),
-                                     (self.width, self.height))]
-                    },
-                    "watering_can": {
-                        "right": [pygame.transform.scale(
-                            tool_sheet.image_at((0, frame_height * 2, frame_width, frame_height)),
-                            (self.width, self.height)),
-                                  pygame.transform.scale(
-                                      tool_sheet.image_at((frame_width, frame_height * 2, frame_width, frame_height)),
-                                      (self.width, self.height))],
-                        "up": [pygame.transform.scale(
-                            tool_sheet.image_at((frame_width * 2, frame_height * 2, frame_width, frame_height)),
-                            (self.width, self.height)),
-                               pygame.transform.scale(
-                                   tool_sheet.image_at((frame_width * 3, frame_height * 2, frame_width, frame_height)),
-                                   (self.width, self.height))],
-                        "left": [pygame.transform.scale(
-                            tool_sheet.image_at((frame_width * 4, frame_height * 2, frame_width, frame_height)),
-                            (self.width, self.height)),
-                                 pygame.transform.scale(tool_sheet.image_at(
-                                     (frame_width * 5, frame_height * 2, frame_width, frame_height)),
-                                                        (self.width, self.height))],
-                        "down": [pygame.transform.scale(
-                            tool_sheet.image_at((frame_width * 6, frame_height * 2, frame_width, frame_height)),
-                            (self.width, self.height)),
-                                 pygame.transform.scale(tool_sheet.image_at(
-                                     (frame_width * 7, frame_height * 2, frame_width, frame_height)),
-                                                        (self.width, self.height))]
+                self.tool_animations = {}
+                for tool, row in tool_rows.items():
+                    self.tool_animations[tool] = {
+                        direction: tool_sheet.load_strip(
+                            (frame_width * column, frame_height * row, frame_width, frame_height), 2, size=size)
+                        for direction, column in direction_columns.items()
                     }
-                }
 
                 print("Tool animations loaded successfully!")
 
@@ -250,6 +190,8 @@ class Player:
                 }
             }
 
+        return self.tool_animations
+
     def handle_event(self, event):
         if event.type == pygame.KEYDOWN:
             if event.key == pygame.K_1:
@@ -270,8 +212,8 @@ class Player:
                     self.cutting = True
                     # Try to cut a tree
                     world = self.game.world
-                    tile_x = (self.x + self.width // 2) // world.tile_size
-                    tile_y = (self.y + self.height // 2) // world.tile_size
+                    tile_x = int(self.x + self.width // 2) // world.tile_size
+                    tile_y = int(self.y + self.height // 2) // world.tile_size
 
                     # Get the position in front of the player based on direction
                     if self.direction == "up":
@@ -292,8 +234,8 @@ class Player:
                     self.planting = True
                     # Try to plant on farmland
                     world = self.game.world
-                    tile_x = (self.x + self.width // 2) // world.tile_size
-                    tile_y = (self.y + self.height // 2) // world.tile_size
+                    tile_x = int(self.x + self.width // 2) // world.tile_size
+                    tile_y = int(self.y + self.height // 2) // world.tile_size
 
                     # Get the position in front of the player based on direction
                     if self.direction == "up":
@@ -307,7 +249,7 @@ class Player:
 
                     if 0 <= tile_x < world.grid_width and 0 <= tile_y < world.grid_height:
                         # Check if the tile is farmland
-                        if world.grid[tile_x][tile_y] == 1:  # Farmland
+                        if world.get_tile(tile_x, tile_y) == 1:  # Farmland
                             # Try to plant a seed
                             plant_x = tile_x * world.tile_size
                             plant_y = tile_y * world.tile_size
@@ -317,8 +259,8 @@ class Player:
                     self.watering = True
                     # Try to water a plant
                     world = self.game.world
-                    tile_x = (self.x + self.width // 2) // world.tile_size
-                    tile_y = (self.y + self.height // 2) // world.tile_size
+                    tile_x = int(self.x + self.width // 2) // world.tile_size
+                    tile_y = int(self.y + self.height // 2) // world.tile_size
 
                     # Get the position in front of the player based on direction
                     if self.direction == "up":
@@ -342,37 +284,42 @@ class Player:
                 self.planting = False
                 self.watering = False
 
-    def update(self):
+    def update(self, dt):
+        self.prev_x = self.x
+        self.prev_y = self.y
+
         # Handle movement
         keys = pygame.key.get_pressed()
+        step = self.speed * dt
 
         # Reset movement flag
         self.moving = False
 
         if keys[pygame.K_LEFT] or keys[pygame.K_a]:
-            self.x -= self.speed
+            self.x -= step
             self.direction = "left"
             self.moving = True
         if keys[pygame.K_RIGHT] or keys[pygame.K_d]:
-            self.x += self.speed
+            self.x += step
             self.direction = "right"
             self.moving = True
         if keys[pygame.K_UP] or keys[pygame.K_w]:
-            self.y -= self.speed
+            self.y -= step
             self.direction = "up"
             self.moving = True
         if keys[pygame.K_DOWN] or keys[pygame.K_s]:
-            self.y += self.speed
+            self.y += step
             self.direction = "down"
             self.moving = True
 
-        # Keep player on screen
-        self.x = max(0, min(self.game.WIDTH - self.width, self.x))
-        self.y = max(0, min(self.game.HEIGHT - self.height, self.y))
+        # Keep player inside the world
+        world = self.game.world
+        self.x = max(0, min(world.width - self.width, self.x))
+        self.y = max(0, min(world.height - self.height, self.y))
 
         # Update animation
         if self.moving or self.using_tool:
-            self.animation_timer += self.animation_speed
+            self.animation_timer += self.animation_speed * dt
             if self.animation_timer >= 1:
                 self.animation_timer = 0
                 if self.using_tool:
@@ -384,30 +331,45 @@ class Player:
                     # Regular movement animation
                     self.frame = (self.frame + 1) % len(self.animations[self.direction])
 
-    def render(self, screen):
+    def render_pos(self):
+        # Position between the last two ticks, matching the time being rendered
+        alpha = self.game.alpha
+        return (self.prev_x + (self.x - self.prev_x) * alpha,
+                self.prev_y + (self.y - self.prev_y) * alpha)
+
+    def get_rect(self):
+        return pygame.Rect(self.render_pos(), (self.width, self.height))
+
+    def get_render_state(self):
+        return self.direction, self.frame, self.using_tool, self.current_tool
+
+    def add_blits(self, draw_list, offset=(0, 0), scale=1):
+        # Screen position: whole world pixels, shifted by the camera position (offset),
+        # in view pixels of scale world pixels
+        x, y = self.render_pos()
+        pos = ((int(x) - offset[0]) // scale, (int(y) - offset[1]) // scale)
+
         # Determine which animation to use
+        current_frame = None
         if self.using_tool and self.current_tool:
             # Use tool animation if available
             if self.direction in self.tool_animations.get(self.current_tool, {}):
                 tool_frames = self.tool_animations[self.current_tool][self.direction]
                 frame_index = min(self.frame, len(tool_frames) - 1)
                 current_frame = tool_frames[frame_index]
-                screen.blit(current_frame, (self.x, self.y))
-
-                # Debug outline
-                if self.debug:
-                    pygame.draw.rect(screen, (255, 0, 0), (self.x, self.y, self.width, self.height), 1)
-                return
 
-        # Use regular movement animation
-        animation_key = self.direction
-        frame_index = min(self.frame, len(self.animations[animation_key]) - 1)
-        current_frame = self.animations[animation_key][frame_index]
+        if current_frame is None:
+            # Use regular movement animation
+            animation_key = self.direction
+            frame_index = min(self.frame, len(self.animations[animation_key]) - 1)
+            current_frame = self.animations[animation_key][frame_index]
 
-        # Draw player
-        screen.blit(current_frame, (self.x, self.y))
+        # Player
+        draw_list.append((current_frame, pos))
 
-        # Debug outline
+        # Debug outline (pre-drawn and shared)
         if self.debug:
-            pygame.draw.rect(screen, (255, 0, 0), (self.x, self.y, self.width, self.height), 1)
+            draw_list.append((asset_cache.outline(self.frame_size, (255, 0, 0)), pos))
 
+    def render(self, screen, offset=(0, 0)):
+        render_blits(self, screen, offset)
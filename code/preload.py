@@ -0,0 +1,71 @@
+import io
+import os
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+import pygame
+from .assets import asset_cache
+
+
+class AssetPreloader:
+    """Decodes the game's images on a thread pool.
+
+    Worker threads read and decode the files; converting a surface to the
+    display format has to happen on the main thread, so poll() converts the
+    finished images and puts them into the asset cache, where later
+    load_image/frame calls find them. The main thread stays free to draw a
+    loading screen meanwhile.
+    """
+
+    def __init__(self, files, workers=4, skip=()):
+        self.files = files
+        self.skip = set(skip)  # Files not to decode (e.g. already baked)
+        self.workers = workers
+        self.executor = None
+        self.pending = {}  # future -> filename
+        self.total = 0
+        self.finished = 0
+        self.failed = 0
+
+    def find_images(self):
+        # Missing files are left for the game's own fallbacks (e.g. placeholder trees)
+        return [image for image in self.files if image not in self.skip and os.path.isfile(image)]
+
+    @staticmethod
+    def decode(filename):
+        with open(filename, "rb") as f:
+            data = f.read()
+        return pygame.image.load(io.BytesIO(data), filename)
+
+    def start(self):
+        images = self.find_images()
+        self.total = len(images)
+        self.executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="preload")
+        self.pending = {self.executor.submit(self.decode, filename): filename for filename in images}
+
+    def poll(self, timeout=0):
+        """Convert and cache the images decoded so far, waiting up to timeout seconds for one.
+
+        Returns the number of images that finished.
+        """
+        if not self.pending:
+            return 0
+        done, _ = wait(list(self.pending), timeout=timeout, return_when=FIRST_COMPLETED)
+        for future in done:
+            filename = self.pending.pop(future)
+            try:
+                asset_cache.add_image(filename, future.result())
+            except Exception as e:
+                print(f"Error preloading {filename}: {e}")
+                self.failed += 1
+            self.finished += 1
+        return len(done)
+
+    def progress(self):
+        return self.finished / self.total if self.total else 1.0
+
+    def done(self):
+        return not self.pending
+
+    def shutdown(self):
+        if self.executor:
+            self.executor.shutdown(wait=True)
+            self.executor = None
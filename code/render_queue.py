@@ -0,0 +1,74 @@
+import bisect
+
+
+class RenderQueue:
+    """Every drawable entity in depth order, kept sorted as entities come, go and move.
+
+    Entities are drawn by the y of their bottom edge (y + height), so whatever
+    stands lower on the screen is drawn over what stands behind it. They are
+    bucketed by that y in whole pixels; the sorted list of occupied buckets
+    only changes when a bucket is created or emptied, so moving an entity is
+    a couple of dict operations instead of a re-sort.
+    """
+
+    def __init__(self):
+        self.buckets = {}  # depth -> {entity: None}, in insertion order
+        self.bucket_keys = []  # Sorted depths of the non-empty buckets
+        self.depths = {}  # entity -> its current depth
+
+    def __len__(self):
+        return len(self.depths)
+
+    def __contains__(self, obj):
+        return obj in self.depths
+
+    def __iter__(self):
+        # Back to front
+        buckets = self.buckets
+        for depth in self.bucket_keys:
+            yield from buckets[depth]
+
+    @staticmethod
+    def depth_of(obj):
+        return int(obj.y + obj.height)
+
+    def add(self, obj, depth=None):
+        if depth is None:
+            depth = self.depth_of(obj)
+        self.depths[obj] = depth
+
+        bucket = self.buckets.get(depth)
+        if bucket is None:
+            bucket = self.buckets[depth] = {}
+            bisect.insort(self.bucket_keys, depth)
+        bucket[obj] = None
+
+    def remove(self, obj):
+        depth = self.depths.pop(obj)
+        bucket = self.buckets[depth]
+        del bucket[obj]
+        if not bucket:
+            del self.buckets[depth]
+            del self.bucket_keys[bisect.bisect_left(self.bucket_keys, depth)]
+
+    def update(self, obj, depth=None):
+        """Re-file an entity that may have moved or changed size."""
+        if depth is None:
+            depth = self.depth_of(obj)
+        if self.depths[obj] != depth:
+            self.remove(obj)
+            self.add(obj, depth)
+
+    def sort(self, objs):
+        """Return some of the queued entities in draw order."""
+        depths = self.depths
+        if len(objs) * 4 > len(depths):
+            # Most of the queue: walking it in order is cheaper than sorting
+            wanted = set(objs)
+            return [obj for obj in self if obj in wanted]
+        return sorted(objs, key=depths.__getitem__)
+
+    def clear(self):
+        self.buckets.clear()
+        self.bucket_keys.clear()
+        self.depths.clear()
@@ -0,0 +1,331 @@
+"""Saving and loading the whole game state in a compact, versioned binary format.
+
+Layout (little-endian):
+
+    header   magic b"PFSV", format version (uint16), flags (uint16)
+    body     zlib-compressed when FLAG_COMPRESSED is set:
+             world/player state (STATE), then length-prefixed sections:
+             crop type names, modified chunk coordinates and their packed
+             tiles, and fixed-width plant, tree and animal records
+
+Only chunks that differ from their generated version are stored; the rest of
+the terrain is regenerated from the world seed.
+"""
+import os
+import queue
+import struct
+import threading
+import time
+import zlib
+import numpy as np
+from .herd import DIRECTIONS, DIRECTION_CODES
+from .chunks import read_chunk_file
+from .plants import Tree
+
+MAGIC = b"PFSV"
+VERSION = 1
+FLAG_COMPRESSED = 1
+
+HEADER = struct.Struct("<4sHH")
+# grid width, grid height, seed, chunk size, game time, player x, player y, player direction
+STATE = struct.Struct("<IIIHdddB")
+COUNT = struct.Struct("<I")
+
+ANIMAL_TYPES = ["chicken", "cow", "sheep"]
+
+PLANT_RECORD = np.dtype([("x", "<i4"), ("y", "<i4"), ("type", "u1"), ("stage", "u1"),
+                         ("timer_base", "<f8"), ("time_base", "<f8"), ("water_until", "<f8")])
+TREE_RECORD = np.dtype([("x", "<i4"), ("y", "<i4"), ("stage", "u1"), ("cut_progress", "u1"),
+                        ("next_growth", "<f8")])
+ANIMAL_RECORD = np.dtype([("x", "<f4"), ("y", "<f4"), ("type", "u1"), ("is_baby", "u1"),
+                          ("direction", "u1"), ("age", "<f4")])
+
+
+def take_snapshot(game):
+    """Copy the game state into plain arrays; cheap enough to run on the main thread."""
+    world = game.world
+    plant_manager = world.plant_manager
+    crops = plant_manager.crops
+    n = crops.count
+
+    plants = np.empty(n, dtype=PLANT_RECORD)
+    plants["x"] = crops.x[:n]
+    plants["y"] = crops.y[:n]
+    plants["type"] = crops.type[:n]
+    plants["stage"] = crops.stage[:n]
+    plants["timer_base"] = crops.timer_base[:n]
+    plants["time_base"] = crops.time_base[:n]
+    plants["water_until"] = crops.water_until[:n]
+
+    growth_times = plant_manager.tree_growth_times()
+    trees = np.array([(tree.x, tree.y, tree.growth_stage, tree.cut_progress, growth_times.get(tree, np.inf))
+                      for tree in plant_manager.trees], dtype=TREE_RECORD)
+
+    animal_manager = world.animal_manager
+    if animal_manager.batched:
+        herd = animal_manager.herd
+        n = herd.count
+        animals = np.empty(n, dtype=ANIMAL_RECORD)
+        animals["x"] = herd.x[:n]
+        animals["y"] = herd.y[:n]
+        animals["type"] = [ANIMAL_TYPES.index(view.animal_type) for view in herd.views]
+        animals["is_baby"] = herd.is_baby[:n]
+        animals["direction"] = herd.direction[:n]
+        animals["age"] = herd.age[:n]
+    else:
+        animals = np.array([(animal.x, animal.y, ANIMAL_TYPES.index(animal.animal_type), animal.is_baby,
+                             DIRECTION_CODES[animal.direction], animal.age)
+                            for animal in animal_manager.animals], dtype=ANIMAL_RECORD)
+
+    # Chunks evicted to disk are only listed here; serialize reads their files
+    modified_chunks, evicted_chunks = world.chunks.modified_chunks()
+
+    player = game.player
+    return {
+        "grid_width": world.grid_width,
+        "grid_height": world.grid_height,
+        "seed": world.seed,
+        "chunk_size": world.chunk_size,
+        "time": plant_manager.time,
+        "player": (player.x, player.y, DIRECTION_CODES[player.direction]),
+        "plant_types": list(crops.type_names),
+        "modified_chunks": modified_chunks,
+        "evicted_chunks": evicted_chunks,
+        "plants": plants,
+        "trees": trees,
+        "animals": animals,
+    }
+
+
+def pack_chunks(snapshot):
+    # Coordinates and tiles of the modified chunks, sorted; runs on the saving thread
+    chunk_size = snapshot["chunk_size"]
+    modified = dict(snapshot["modified_chunks"])
+    for key, path in snapshot["evicted_chunks"].items():
+        modified[key] = read_chunk_file(path, chunk_size)
+
+    chunk_keys = sorted(modified)
+    chunk_coords = np.array(chunk_keys, dtype="<u2").reshape(-1, 2)
+    chunk_tiles = np.array([modified[key] for key in chunk_keys], dtype=np.uint8).reshape(
+        -1, chunk_size, chunk_size)
+    return chunk_coords, chunk_tiles
+
+
+def serialize(snapshot, compress=True):
+    player_x, player_y, player_direction = snapshot["player"]
+    names = "\n".join(snapshot["plant_types"]).encode("utf-8")
+    chunk_coords, chunk_tiles = pack_chunks(snapshot)
+
+    parts = [
+        STATE.pack(snapshot["grid_width"], snapshot["grid_height"], snapshot["seed"], snapshot["chunk_size"],
+                   snapshot["time"], player_x, player_y, player_direction),
+        COUNT.pack(len(names)), names,
+        COUNT.pack(len(chunk_coords)), chunk_coords.tobytes(),
+        chunk_tiles.tobytes(),
+    ]
+    for name in ("plants", "trees", "animals"):
+        parts.append(COUNT.pack(len(snapshot[name])))
+        parts.append(snapshot[name].tobytes())
+    body = b"".join(parts)
+
+    flags = 0
+    if compress:
+        body = zlib.compress(body, 1)  # Fast level; tile data compresses well anyway
+        flags |= FLAG_COMPRESSED
+    return HEADER.pack(MAGIC, VERSION, flags) + body
+
+
+def deserialize(data):
+    """Parse a save file; a truncated or corrupt one raises ValueError."""
+    try:
+        return read_body(data)
+    except (struct.error, zlib.error) as e:
+        raise ValueError(f"Corrupt save file: {e}") from e
+
+
+def check_index(name, values, count):
+    # Records index into the type and direction tables; one past the end is a corrupt file
+    if len(values) and int(np.max(values)) >= count:
+        raise ValueError(f"Corrupt save file: {name} {int(np.max(values))} out of range")
+
+
+def read_body(data):
+    magic, version, flags = HEADER.unpack_from(data)
+    if magic != MAGIC:
+        raise ValueError("Not a save file")
+    if version != VERSION:
+        raise ValueError(f"Unsupported save version {version}")
+
+    body = data[HEADER.size:]
+    if flags & FLAG_COMPRESSED:
+        body = zlib.decompress(body)
+
+    grid_width, grid_height, seed, chunk_size, game_time, player_x, player_y, player_direction = \
+        STATE.unpack_from(body)
+    offset = STATE.size
+
+    def read_count():
+        nonlocal offset
+        (count,) = COUNT.unpack_from(body, offset)
+        offset += COUNT.size
+        return count
+
+    def read_array(dtype, count, shape=None):
+        nonlocal offset
+        array = np.frombuffer(body, dtype=dtype, count=count, offset=offset)
+        offset += array.nbytes
+        return array if shape is None else array.reshape(shape)
+
+    length = read_count()
+    names = body[offset:offset + length].decode("utf-8")
+    offset += length
+
+    chunk_count = read_count()
+    chunk_coords = read_array("<u2", chunk_count * 2, (chunk_count, 2))
+    chunk_tiles = read_array(np.uint8, chunk_count * chunk_size * chunk_size, (chunk_count, chunk_size, chunk_size))
+
+    state = {
+        "grid_width": grid_width,
+        "grid_height": grid_height,
+        "seed": seed,
+        "chunk_size": chunk_size,
+        "time": game_time,
+        "player": (player_x, player_y, player_direction),
+        "plant_types": names.split("\n") if names else [],
+        "chunk_coords": chunk_coords,
+        "chunk_tiles": chunk_tiles,
+    }
+    for name, dtype in (("plants", PLANT_RECORD), ("trees", TREE_RECORD), ("animals", ANIMAL_RECORD)):
+        state[name] = read_array(dtype, read_count())
+
+    # Checked here, before apply_state starts replacing the running game
+    check_index("player direction", [player_direction], len(DIRECTIONS))
+    check_index("plant type", state["plants"]["type"], len(state["plant_types"]))
+    check_index("animal type", state["animals"]["type"], len(ANIMAL_TYPES))
+    check_index("animal direction", state["animals"]["direction"], len(DIRECTIONS))
+    return state
+
+
+def write_file(path, data):
+    # Write to a temporary file and swap it in, so a crash never leaves a half-written save
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    temp_path = path + ".tmp"
+    with open(temp_path, "wb") as f:
+        f.write(data)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(temp_path, path)
+
+
+def save_game(game, path, compress=True):
+    write_file(path, serialize(take_snapshot(game), compress))
+
+
+def load_game(game, path):
+    with open(path, "rb") as f:
+        state = deserialize(f.read())
+    apply_state(game, state)
+
+
+def apply_state(game, state):
+    """Replace the running game's world, entities and player with a loaded state."""
+    world = game.world
+    if state["chunk_size"] != world.chunk_size:
+        raise ValueError(f"Save uses chunks of {state['chunk_size']} tiles, not {world.chunk_size}")
+
+    # Terrain: copies, since chunks modify their tiles in place
+    modified = {(int(cx), int(cy)): tiles.copy()
+                for (cx, cy), tiles in zip(state["chunk_coords"], state["chunk_tiles"])}
+    world.restore_tiles(state["seed"], state["grid_width"], state["grid_height"], modified)
+
+    # Plants and trees, on the saved game clock
+    plant_manager = world.plant_manager
+    plant_manager.time = state["time"]
+    plant_manager.clear()
+    plant_manager.load_plants(state["plants"], state["plant_types"])
+    for x, y, stage, cut_progress, next_growth in state["trees"].tolist():
+        tree = Tree(game, x, y)
+        tree.growth_stage = stage
+        tree.cut_progress = cut_progress
+        plant_manager.add_tree(tree, next_growth)
+
+    # Animals
+    animal_manager = world.animal_manager
+    animal_manager.clear()
+    for x, y, type_index, is_baby, direction, age in state["animals"].tolist():
+        animal = animal_manager.add_animal(x, y, ANIMAL_TYPES[type_index], bool(is_baby))
+        animal.direction = DIRECTIONS[direction]
+        animal.age = age
+
+    # Player
+    player = game.player
+    player.x, player.y, direction = state["player"]
+    player.prev_x, player.prev_y = player.x, player.y
+    player.direction = DIRECTIONS[direction]
+    world.render_queue.update(player)
+
+    # Everything on screen changed
+    game.full_redraw = True
+    game.render_states = {}
+
+
+class Autosaver:
+    """Saves the game periodically without stalling the game loop.
+
+    The state is snapshotted on the main thread (mostly array copies); a
+    worker thread reads the evicted chunks, serializes, compresses, writes and
+    fsyncs it. A save that is
+    due while the previous one is still being written is skipped, unless the
+    caller asks to wait for that write (e.g. the save on exit).
+    """
+
+    def __init__(self, game, path, interval, compress=True):
+        self.game = game
+        self.path = path
+        self.interval = interval  # Seconds of real time between saves
+        self.compress = compress
+        self.last_save = time.perf_counter()
+
+        self.pending = queue.Queue()
+        self.busy = False
+        self.thread = threading.Thread(target=self.work, name="autosave", daemon=True)
+        self.thread.start()
+
+    def tick(self):
+        now = time.perf_counter()
+        if now - self.last_save >= self.interval:
+            self.last_save = now
+            self.save()
+
+    def save(self, wait=False):
+        if self.busy:
+            if not wait:
+                print("Save skipped: the previous save is still being written")
+                return False
+            self.wait()
+        self.busy = True
+        self.pending.put(take_snapshot(self.game))
+        return True
+
+    def wait(self):
+        # Block until every requested save is on disk
+        self.pending.join()
+
+    def work(self):
+        while True:
+            snapshot = self.pending.get()
+            try:
+                if snapshot is None:
+                    return
+                start = time.perf_counter()
+                write_file(self.path, serialize(snapshot, self.compress))
+                print(f"Game saved to {self.path} ({time.perf_counter() - start:.3f} s)")
+            except Exception as e:
+                print(f"Error saving game: {e}")
+            finally:
+                self.busy = False
+                self.pending.task_done()
+
+    def stop(self):
+        self.pending.put(None)
+        self.thread.join()
@@ -0,0 +1,39 @@
+import heapq
+import itertools
+
+
+class EventQueue:
+    """Priority queue of timed events, ordered by game time.
+
+    An event is (time, target, version). Targets that change their plans bump
+    their version, which turns the events scheduled earlier into no-ops
+    (they are skipped by the owner when popped) instead of searching the heap.
+    """
+
+    def __init__(self):
+        self.heap = []
+        self.counter = itertools.count()  # Tie-breaker so targets are never compared
+
+    def __len__(self):
+        return len(self.heap)
+
+    def schedule(self, time, target, version=0):
+        heapq.heappush(self.heap, (time, next(self.counter), target, version))
+
+    def schedule_many(self, times, targets, versions):
+        # Bulk insert (e.g. when loading a game): one heapify instead of a push per event
+        self.heap.extend(zip(times, self.counter, targets, versions))
+        heapq.heapify(self.heap)
+
+    def next_time(self):
+        return self.heap[0][0] if self.heap else None
+
+    def pop_due(self, now):
+        """Yield (time, target, version) for every event due at or before now."""
+        heap = self.heap
+        while heap and heap[0][0] <= now:
+            time, _, target, version = heapq.heappop(heap)
+            yield time, target, version
+
+    def clear(self):
+        self.heap.clear()
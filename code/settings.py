@@ -5,3 +5,83 @@ FPS = 60
 WHITE = (255, 255, 255)
 GREEN = (34, 177, 76)
 BROWN = (139, 69, 19)
+
+# Upper bound for the shared sprite cache (decoded sheets and scaled frames)
+ASSET_CACHE_MAX_BYTES = 32 * 1024 * 1024
+
+# Side of the texture atlas pages that sprite frames are packed into
+ATLAS_PAGE_SIZE = 512
+
+# Number of rendered text surfaces (menu, overlay) kept between frames
+TEXT_CACHE_MAX_ENTRIES = 256
+
+# Redraw and push only the changed screen rectangles instead of flipping the whole frame
+DIRTY_RECT_RENDERING = False
+
+# World size in tiles (None: same as one screen)
+WORLD_WIDTH_TILES = None
+WORLD_HEIGHT_TILES = None
+
+# Tiles are stored in square chunks, streamed in around the view and evicted to disk
+CHUNK_SIZE = 16
+CHUNK_LOAD_MARGIN = 1
+CHUNK_CACHE_DIR = "saves/chunks"
+
+# Camera zoom range and step (+/- keys); 1.0 shows the world at its native size
+CAMERA_MIN_ZOOM = 0.5
+CAMERA_MAX_ZOOM = 3.0
+CAMERA_ZOOM_STEP = 1.25
+
+# The sprite art is drawn at PIXEL_ART_SCALE times its native size. With NATIVE_RESOLUTION
+# sprites are loaded at the art's own size, the world is composed at that size (400x300)
+# and scaled up once per frame, straight into the window
+PIXEL_ART_SCALE = 2
+NATIVE_RESOLUTION = False
+
+# The window is a whole multiple of the 800x600 screen the game is laid out in
+WINDOW_SCALE = 1
+
+# Keep animal state in NumPy arrays and update the whole herd in one vectorized step
+BATCHED_ANIMALS = False
+
+# Fixed simulation rate: the game state advances in ticks of 1 / TICK_RATE seconds,
+# independent of how fast frames are rendered
+TICK_RATE = 60
+
+# Longest frame time fed to the simulation, so a stall does not trigger a burst of catch-up ticks
+MAX_FRAME_TIME = 0.25
+
+# Saved games: the state is snapshotted on the main thread and written by a background thread
+SAVE_PATH = "saves/savegame.bin"
+SAVE_COMPRESSION = True
+AUTOSAVE_INTERVAL = 120  # Seconds of real time between autosaves
+
+# Images the game loads, decoded in the background at startup
+ASSET_FILES = [
+    "assets/images/tiles/Grass_Middle.png",
+    "assets/images/tiles/FarmLand_Tile.png",
+    "assets/images/tiles/Water_Middle.png",
+    "assets/images/tiles/Path_Middle.png",
+    "assets/images/tiles/Beach_Tile.png",
+    "assets/images/tiles/Cliff_Tile.png",
+    "assets/images/buildings/House.png",
+    "assets/images/characters/PixelFarm_Farmer-Sheet.png",
+    "assets/images/tools/PixelFarm_Tool Animation-Sheet.png",
+    "assets/images/items/PixelFarm_Item.png",
+    "assets/images/trees/Oak_Tree.png",
+    "assets/images/trees/Oak_Tree_Small.png",
+    "assets/images/animals/PixelFarm_Chicken-Sheet.png",
+    "assets/images/animals/PixelFarm_BabyChicken-Sheet.png",
+    "assets/images/animals/PixelFarm_Cow-Sheet.png",
+    "assets/images/animals/PixelFarm_BabyCow-Sheet.png",
+    "assets/images/animals/PixelFarm_Sheep-Sheet.png",
+    "assets/images/animals/PixelFarm_BabySheep-Sheet.png",
+    "assets/images/ui/menu_background.png",
+]
+
+# Longest wait for a decoded image per loading step, in seconds; a frame with nothing
+# ready goes back to the menu loop instead of polling for the rest of its budget
+LOADING_POLL_TIMEOUT = 0.002
+
+# Pre-sliced and pre-scaled frames written by "python -m code.bake"; used at startup when present
+BAKED_ASSET_DIR = "assets/baked"
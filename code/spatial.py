@@ -0,0 +1,66 @@
+import pygame
+
+
+class SpatialHash:
+    """Buckets objects by grid cell so neighbourhood and range lookups stay O(1).
+
+    Each object is stored with a rect; it is registered in every cell the rect
+    overlaps. Queries only visit the cells covered by the query rect.
+    """
+
+    def __init__(self, cell_size=64):
+        self.cell_size = cell_size
+        self.cells = {}
+        self.rects = {}
+
+    def __len__(self):
+        return len(self.rects)
+
+    def __contains__(self, obj):
+        return obj in self.rects
+
+    def cell_range(self, rect):
+        size = self.cell_size
+        return (rect.left // size, rect.top // size,
+                (rect.right - 1) // size, (rect.bottom - 1) // size)
+
+    def insert(self, obj, rect):
+        rect = pygame.Rect(rect)
+        self.rects[obj] = rect
+
+        min_cx, min_cy, max_cx, max_cy = self.cell_range(rect)
+        for cx in range(min_cx, max_cx + 1):
+            for cy in range(min_cy, max_cy + 1):
+                self.cells.setdefault((cx, cy), {})[obj] = None
+
+    def remove(self, obj):
+        rect = self.rects.pop(obj)
+
+        min_cx, min_cy, max_cx, max_cy = self.cell_range(rect)
+        for cx in range(min_cx, max_cx + 1):
+            for cy in range(min_cy, max_cy + 1):
+                cell = self.cells[(cx, cy)]
+                del cell[obj]
+                if not cell:
+                    del self.cells[(cx, cy)]
+
+    def move(self, obj, rect):
+        self.remove(obj)
+        self.insert(obj, rect)
+
+    def query_rect(self, rect):
+        """Return the objects whose rect overlaps the given rect."""
+        rect = pygame.Rect(rect)
+        found = {}
+
+        min_cx, min_cy, max_cx, max_cy = self.cell_range(rect)
+        for cx in range(min_cx, max_cx + 1):
+            for cy in range(min_cy, max_cy + 1):
+                cell = self.cells.get((cx, cy))
+                if cell:
+                    found.update(cell)
+
+        return [obj for obj in found if self.rects[obj].colliderect(rect)]
+
+    def query_point(self, x, y):
+        return self.query_rect((x, y, 1, 1))
@@ -0,0 +1,51 @@
+from collections import OrderedDict
+from .settings import TEXT_CACHE_MAX_ENTRIES
+
+
+class TextCache:
+    """LRU cache of rendered text surfaces.
+
+    Font.render rasterizes every glyph on each call, which is wasted work for
+    menu and HUD text that stays the same from frame to frame. Surfaces are
+    keyed by (font, text, colour, antialias) and shared, so callers must treat
+    them as read-only.
+    """
+
+    def __init__(self, max_entries=TEXT_CACHE_MAX_ENTRIES):
+        self.max_entries = max_entries
+        self.entries = OrderedDict()
+
+        # Statistics
+        self.hits = 0
+        self.misses = 0
+
+    def render(self, font, text, color, antialias=True):
+        """Drop-in replacement for font.render(text, antialias, color)."""
+        key = (font, text, tuple(color), antialias)
+        surface = self.entries.get(key)
+        if surface is not None:
+            self.entries.move_to_end(key)
+            self.hits += 1
+            return surface
+
+        self.misses += 1
+        surface = font.render(text, antialias, color)
+        self.entries[key] = surface
+        if len(self.entries) > self.max_entries:
+            self.entries.popitem(last=False)
+        return surface
+
+    def clear(self):
+        self.entries.clear()
+
+    def stats(self):
+        return {
+            "entries": len(self.entries),
+            "max_entries": self.max_entries,
+            "hits": self.hits,
+            "misses": self.misses,
+        }
+
+
+# Shared by the menu and the overlays
+text_cache = TextCache()
@@ -0,0 +1,178 @@
+import time
+from collections import deque
+import pygame
+from .assets import asset_cache
+from .text import text_cache
+from .atlas import atlas
+
+
+class PerformanceOverlay:
+    """Debug overlay (toggled with F3) showing frame times and per-subsystem timers.
+
+    Timers are hooks installed on the game objects only while the overlay is
+    shown: the timed methods are wrapped by instance attributes that shadow the
+    class methods, and removed again when it is hidden, so a hidden overlay
+    costs nothing.
+    """
+
+    history_length = 120  # Frames kept in the graph
+    graph_height = 60
+    graph_scale = 2  # Pixels per millisecond
+
+    def __init__(self, game):
+        self.game = game
+        self.visible = False
+
+        # Time spent in each hooked section during the current frame, in seconds
+        self.current = {}
+        self.history = {}
+        self.frame_times = deque(maxlen=self.history_length)
+
+        # (object, attribute) pairs currently wrapped
+        self.hooks = []
+
+        self.font = None
+        self.panel = None
+        self.stats_lines = []
+        self.frames_since_stats = 0
+
+    def sections(self):
+        # (label, object, method name) for every timed section, in display order
+        game = self.game
+        world = game.world
+        return [
+            ("handle_events", game, "handle_events"),
+            ("World.update", world, "update"),
+            ("AnimalManager.update", world.animal_manager, "update"),
+            ("PlantManager.update", world.plant_manager, "update"),
+            ("Player.update", game.player, "update"),
+            ("Terrain render", world, "render_terrain"),
+            ("Entities render", world, "render_entities"),
+            ("Player draw list", game.player, "add_blits"),
+            ("Dirty-rect render", game, "render_dirty"),
+            ("display.flip", game, "present"),
+        ]
+
+    def toggle(self):
+        if self.visible:
+            self.hide()
+        else:
+            self.show()
+
+        # The overlay covers part of the picture, so redraw everything next frame
+        self.game.full_redraw = True
+
+    def show(self):
+        self.visible = True
+        if self.font is None:
+            pygame.font.init()
+            self.font = pygame.font.SysFont("Arial", 14)
+
+        for label, obj, name in self.sections():
+            self.current[label] = 0.0
+            self.history.setdefault(label, deque(maxlen=self.history_length))
+            setattr(obj, name, self.timed(label, getattr(obj, name)))
+            self.hooks.append((obj, name))
+
+    def hide(self):
+        self.visible = False
+
+        # Drop the wrappers so the class methods are used again
+        for obj, name in self.hooks:
+            obj.__dict__.pop(name, None)
+        self.hooks = []
+
+    def timed(self, label, method):
+        current = self.current
+        perf_counter = time.perf_counter
+
+        def wrapper(*args, **kwargs):
+            start = perf_counter()
+            result = method(*args, **kwargs)
+            current[label] += perf_counter() - start
+            return result
+
+        return wrapper
+
+    def end_frame(self, frame_time):
+        """Record the sections timed during the frame that just ended (frame_time in seconds)."""
+        self.frame_times.append(frame_time * 1000.0)
+        for label, total in self.current.items():
+            self.history[label].append(total * 1000.0)
+            self.current[label] = 0.0
+
+    def get_rect(self):
+        width = self.history_length * 2 + 20
+        height = self.graph_height + 20 + 18 * (3 + len(self.history)) + 10
+        return pygame.Rect(8, 8, width, height)
+
+    def collect_stats(self):
+        # Entity counts and surface memory only change slowly; refresh them twice a second
+        game = self.game
+        world = game.world
+        plant_manager = world.plant_manager
+
+        chunk_bytes = 0
+        for chunk in world.chunks.chunks.values():
+            if chunk.surface is not None:
+                chunk_bytes += chunk.surface.get_bytesize() * chunk.surface.get_width() * chunk.surface.get_height()
+        screen = game.screen
+        screen_bytes = screen.get_bytesize() * screen.get_width() * screen.get_height()
+        total_bytes = asset_cache.total_bytes + chunk_bytes + screen_bytes
+        atlas_stats = atlas.stats()
+
+        self.stats_lines = [
+            f"Plants {len(plant_manager.plants)}  Trees {len(plant_manager.trees)}  "
+            f"Animals {len(world.animal_manager.animals)}  Chunks {len(world.chunks.chunks)}",
+            f"Surfaces {total_bytes / (1024 * 1024):.1f} MB "
+            f"(assets {asset_cache.total_bytes / (1024 * 1024):.1f}, terrain {chunk_bytes / (1024 * 1024):.1f})",
+            f"Atlas {atlas_stats['pages']} pages, {atlas_stats['frames']} frames, "
+            f"{atlas_stats['bytes'] / (1024 * 1024):.1f} MB ({atlas_stats['used']:.0%} used)",
+            f"Text cache {len(text_cache.entries)}/{text_cache.max_entries}  "
+            f"hits {text_cache.hits}  misses {text_cache.misses}",
+        ]
+
+    def render(self, screen):
+        if self.frames_since_stats == 0:
+            self.collect_stats()
+        self.frames_since_stats = (self.frames_since_stats + 1) % 30
+
+        rect = self.get_rect()
+        if self.panel is None or self.panel.get_size() != rect.size:
+            self.panel = pygame.Surface(rect.size, pygame.SRCALPHA)
+        self.panel.fill((0, 0, 0, 170))
+        screen.blit(self.panel, rect.topleft)
+
+        # Frame-time graph, with a line at the target frame time
+        graph_left = rect.left + 10
+        graph_bottom = rect.top + 10 + self.graph_height
+        target_ms = 1000.0 / self.game.FPS
+        for i, frame_ms in enumerate(self.frame_times):
+            height = min(self.graph_height, int(frame_ms * self.graph_scale))
+            color = (80, 220, 80) if frame_ms <= target_ms * 1.1 else (230, 80, 60)
+            pygame.draw.line(screen, color, (graph_left + i * 2, graph_bottom),
+                             (graph_left + i * 2, graph_bottom - height))
+        target_y = graph_bottom - min(self.graph_height, int(target_ms * self.graph_scale))
+        pygame.draw.line(screen, (255, 255, 0), (graph_left, target_y),
+                         (graph_left + self.history_length * 2, target_y))
+
+        # Text
+        last_frame = self.frame_times[-1] if self.frame_times else 0.0
+        lines = [f"FPS {self.game.clock.get_fps():.1f} / {self.game.FPS}  "
+                 f"tick {self.game.tick_rate} Hz  frame {last_frame:.1f} ms"]
+        for label, samples in self.history.items():
+            if samples:
+                average = sum(samples) / len(samples)
+                lines.append((label, f"{average:.2f} ms  (max {max(samples):.2f})"))
+        lines.extend(self.stats_lines)
+
+        y = graph_bottom + 10
+        for line in lines:
+            if isinstance(line, tuple):
+                # Timer rows: label and value in two columns
+                label, value = line
+                screen.blit(text_cache.render(self.font, label, (255, 255, 255)), (graph_left, y))
+                screen.blit(text_cache.render(self.font, value, (255, 255, 255)), (graph_left + 150, y))
+            else:
+                screen.blit(text_cache.render(self.font, line, (255, 255, 255)), (graph_left, y))
+            y += 18
@@ -1,119 +1,200 @@
 import pygame
 import random
 import os
-from .animals import AnimalManager
+import numpy as np
+from numpy.random import default_rng
+from .animals import Animal, AnimalManager
 from .plants import PlantManager
+from .chunks import ChunkStore
+from .render_queue import RenderQueue
+from .camera import Camera
+from .blitting import blit_all
+from .atlas import atlas
+from .assets import asset_cache
+from .settings import WORLD_WIDTH_TILES, WORLD_HEIGHT_TILES, CHUNK_SIZE, CHUNK_LOAD_MARGIN, CHUNK_CACHE_DIR
 
 
 class World:
-    def __init__(self, game):
+    def __init__(self, game, build=True):
         self.game = game
-        self.width = game.WIDTH
-        self.height = game.HEIGHT
 
         # Tile size
         self.tile_size = 32
 
-        # Create tile grid
-        self.grid_width = self.width // self.tile_size
-        self.grid_height = self.height // self.tile_size
-        self.grid = [[0 for _ in range(self.grid_height)] for _ in range(self.grid_width)]
+        # The home area (farm, pond and house) covers the first screen of the world
+        self.home_width = game.WIDTH // self.tile_size
+        self.home_height = game.HEIGHT // self.tile_size
 
-        # Initialize tile types
-        # 0: grass, 1: farmland, 2: water, 3: stone, 4: path, 5: beach, 6: cliff
-        self.generate_world()
+        # World size in tiles; it may be far larger than the screen
+        world_width, world_height = game.world_size or (WORLD_WIDTH_TILES, WORLD_HEIGHT_TILES)
+        self.grid_width = world_width or self.home_width
+        self.grid_height = world_height or self.home_height
+        self.width = self.grid_width * self.tile_size
+        self.height = self.grid_height * self.tile_size
+
+        # Part of the world shown on screen (follows the player once it exists); at
+        # native resolution it is composed in view pixels of pixel_scale world pixels
+        self.pixel_scale = game.pixel_scale
+        self.view_tile_size = self.tile_size // self.pixel_scale
+        self.camera = Camera((game.WIDTH, game.HEIGHT), (self.width, self.height), pixel_scale=self.pixel_scale)
+
+        # Tiles live in fixed-size chunks that are generated on demand around the view
+        self.chunk_size = CHUNK_SIZE
+        self.chunk_pixels = self.chunk_size * self.tile_size
+        self.seed = random.getrandbits(32)
+
+        # House position
+        self.house_pos = (game.WIDTH // 2 - 64, game.HEIGHT // 4 - 64)
+
+        # Plants, trees, animals and the player share one depth-sorted draw order
+        self.render_queue = RenderQueue()
 
-        # Load tile sprites
+        # (surface, position) pairs of the layer being drawn, reused every frame
+        self.draw_list = []
+
+        # Blits in the last frame of each layer (for throughput measurements)
+        self.terrain_blits = 0
+        self.entity_blits = 0
+
+        # The game builds the rest in steps between loading frames (build=False)
+        if build:
+            for _ in self.build_steps():
+                pass
+
+    def build_steps(self):
+        """Load sprites, generate the terrain around the view and create the managers.
+
+        Yields after each step; the slowest, generating a chunk, takes a few ms.
+        """
+        # Load tile sprites (drawn from the texture atlas, where they are packed once per process)
         self.load_tiles()
+        self.tile_sprites = atlas.pack(f"tiles/{self.pixel_scale}", self.tile_sprites)
+        yield
 
         # Load background
         self.load_background()
+        yield
 
-        # House position
-        self.house_pos = (self.width // 2 - 64, self.height // 4 - 64)
+        # Initialize tile types
+        # 0: grass, 1: farmland, 2: water, 3: stone, 4: path, 5: beach, 6: cliff
+        yield from self.generate_steps()
 
         # Initialize managers
-        self.animal_manager = AnimalManager(game)
-        self.plant_manager = PlantManager(game)
+        Animal.prepare_animations(self.pixel_scale)
+        yield
+        self.animal_manager = AnimalManager(self.game, self.render_queue, bounds=(self.width, self.height))
+        yield
+        self.plant_manager = PlantManager(self.game, self.render_queue)
 
     def generate_world(self):
-        # Fill the world with grass
-        for x in range(self.grid_width):
-            for y in range(self.grid_height):
-                # Default to grass
-                self.grid[x][y] = 0
+        for _ in self.generate_steps():
+            pass
+
+    def generate_steps(self):
+        # Chunks are generated lazily from the world seed, so (re)generating the
+        # world only means starting from an empty chunk store; the chunks
+        # around the view are generated one per step
+        max_chunk = ((self.grid_width - 1) // self.chunk_size, (self.grid_height - 1) // self.chunk_size)
+        self.chunks = ChunkStore(self.chunk_size, self.generate_chunk, CHUNK_CACHE_DIR, max_chunk)
+        chunk_range = self.visible_chunk_range()
+        if chunk_range is not None:
+            yield from self.chunks.stream_steps(*chunk_range, margin=CHUNK_LOAD_MARGIN)
+
+    def close(self):
+        # Delete this session's evicted chunks (modified tiles live in the saves)
+        self.chunks.close()
+
+    def restore_tiles(self, seed, grid_width, grid_height, modified_chunks):
+        """Replace the terrain with a saved one: its seed, size and modified chunks."""
+        self.chunks.discard()
+        self.grid_width = grid_width
+        self.grid_height = grid_height
+        self.width = grid_width * self.tile_size
+        self.height = grid_height * self.tile_size
+        self.seed = seed
+
+        # The camera and the animals are kept inside the new size
+        self.camera.world_width, self.camera.world_height = self.width, self.height
+        self.animal_manager.bounds = (self.width, self.height)
+
+        max_chunk = ((self.grid_width - 1) // self.chunk_size, (self.grid_height - 1) // self.chunk_size)
+        self.chunks = ChunkStore(self.chunk_size, self.generate_chunk, CHUNK_CACHE_DIR, max_chunk)
+        self.chunks.restore(modified_chunks)
+        self.stream_chunks()
+
+    def generate_chunk(self, cx, cy):
+        rng = default_rng([self.seed, cx, cy])
+        return self.generate_region(cx * self.chunk_size, cy * self.chunk_size,
+                                    self.chunk_size, self.chunk_size, rng)
+
+    def generate_region(self, x0, y0, width, height, rng):
+        """Generate the tiles of the rectangle (x0, y0, width, height) of the world.
+
+        Returns a (height, width) uint8 array indexed [y, x]. Every step is an
+        array operation, so whole maps can be generated in one call as well.
+        """
+        # Fill the region with grass
+        tiles = np.zeros((height, width), dtype=np.uint8)
+        ys, xs = np.ogrid[y0:y0 + height, x0:x0 + width]
+        inside = (xs >= 0) & (xs < self.grid_width) & (ys >= 0) & (ys < self.grid_height)
 
         # Create a farmland area in front of where the house will be
-        farm_center_x = self.grid_width // 2
-        farm_center_y = self.grid_height // 2 + 3
+        farm_center_x = self.home_width // 2
+        farm_center_y = self.home_height // 2 + 3
         farm_width = 8
         farm_height = 6
 
-        for x in range(farm_center_x - farm_width // 2, farm_center_x + farm_width // 2):
-            for y in range(farm_center_y - farm_height // 2, farm_center_y + farm_height // 2):
-                if 0 <= x < self.grid_width and 0 <= y < self.grid_height:
-                    self.grid[x][y] = 1  # Farmland
+        farmland = ((xs >= farm_center_x - farm_width // 2) & (xs < farm_center_x + farm_width // 2) &
+                    (ys >= farm_center_y - farm_height // 2) & (ys < farm_center_y + farm_height // 2))
+        tiles[farmland] = 1
 
         # Add some water spots (small pond)
         pond_x = farm_center_x + farm_width
         pond_y = farm_center_y
         pond_size = 3
 
-        for x in range(pond_x - pond_size, pond_x + pond_size):
-            for y in range(pond_y - pond_size, pond_y + pond_size):
-                if 0 <= x < self.grid_width and 0 <= y < self.grid_height:
-                    # Make a circular-ish pond
-                    if (x - pond_x) ** 2 + (y - pond_y) ** 2 < pond_size ** 2:
-                        self.grid[x][y] = 2  # Water
+        def water_mask(xs, ys):
+            # Make a circular-ish pond inside its bounding square and the world
+            return ((xs >= pond_x - pond_size) & (xs < pond_x + pond_size) &
+                    (ys >= pond_y - pond_size) & (ys < pond_y + pond_size) &
+                    (xs >= 0) & (xs < self.grid_width) & (ys >= 0) & (ys < self.grid_height) &
+                    ((xs - pond_x) ** 2 + (ys - pond_y) ** 2 < pond_size ** 2))
+
+        tiles[water_mask(xs, ys)] = 2
 
         # Add some paths around the farm
         # Horizontal path in front of the house
         path_y = farm_center_y - farm_height // 2 - 1
-        for x in range(farm_center_x - 4, farm_center_x + 4):
-            if 0 <= x < self.grid_width and 0 <= path_y < self.grid_height:
-                self.grid[x][path_y] = 4  # Path
-
-        # Add some beach tiles around the water
-        for x in range(self.grid_width):
-            for y in range(self.grid_height):
-                if self.grid[x][y] == 2:  # If it's water
-                    # Check adjacent tiles
-                    for dx in [-1, 0, 1]:
-                        for dy in [-1, 0, 1]:
-                            nx, ny = x + dx, y + dy
-                            if (0 <= nx < self.grid_width and
-                                    0 <= ny < self.grid_height and
-                                    self.grid[nx][ny] == 0):  # If it's grass
-                                # Convert to beach
-                                self.grid[nx][ny] = 5  # Beach
+        tiles[(ys == path_y) & (xs >= farm_center_x - 4) & (xs < farm_center_x + 4)] = 4
+
+        # Add some beach tiles around the water: dilate the water mask of a
+        # one-tile padded window and convert the grass it touches
+        padded_ys, padded_xs = np.ogrid[y0 - 1:y0 + height + 1, x0 - 1:x0 + width + 1]
+        padded_water = water_mask(padded_xs, padded_ys)
+        near_water = np.zeros((height, width), dtype=bool)
+        for dy in range(3):
+            for dx in range(3):
+                near_water |= padded_water[dy:dy + height, dx:dx + width]
+        tiles[near_water & (tiles == 0)] = 5
 
         # Add some cliff tiles at the edges of the map
-        for x in range(self.grid_width):
-            for y in range(5):  # Top edge
-                if random.random() < 0.7:
-                    self.grid[x][y] = 6  # Cliff
-
-            for y in range(self.grid_height - 5, self.grid_height):  # Bottom edge
-                if random.random() < 0.7:
-                    self.grid[x][y] = 6  # Cliff
+        # Tiles in a corner belong to two edges and get two chances
+        edges = ((ys < 5).astype(np.uint8) + (ys >= self.grid_height - 5) +
+                 (xs < 5) + (xs >= self.grid_width - 5))
+        draws = rng.random((2, height, width)) < 0.7
+        cliffs = ((draws[0] & (edges >= 1)) | (draws[1] & (edges >= 2))) & inside
+        tiles[cliffs] = 6
 
-        for y in range(self.grid_height):
-            for x in range(5):  # Left edge
-                if random.random() < 0.7:
-                    self.grid[x][y] = 6  # Cliff
+        # Add some stone patches (about five per screen of tiles)
+        attempts = int(5 * width * height / (self.home_width * self.home_height) + rng.random())
+        flat_tiles = tiles.reshape(-1)
+        candidates = rng.integers(0, width * height, attempts)
 
-            for x in range(self.grid_width - 5, self.grid_width):  # Right edge
-                if random.random() < 0.7:
-                    self.grid[x][y] = 6  # Cliff
+        # Don't place stones on farmland, water, or paths (or past the world edge)
+        candidates = candidates[(flat_tiles[candidates] == 0) & inside.reshape(-1)[candidates]]
+        flat_tiles[candidates] = 3
 
-        # Add some stone patches
-        for _ in range(5):
-            stone_x = random.randint(0, self.grid_width - 1)
-            stone_y = random.randint(0, self.grid_height - 1)
-
-            # Don't place stones on farmland, water, or paths
-            if self.grid[stone_x][stone_y] == 0:
-                self.grid[stone_x][stone_y] = 3  # Stone
+        return tiles
 
     def load_tiles(self):
         print("Loading tile sprites")
@@ -121,41 +202,35 @@ class World:
         # Make sure the directory exists
         os.makedirs("assets/images/tiles", exist_ok=True)
 
-        # Load actual tile sprites
+        # Load actual tile sprites, at the size they are drawn into the view
+        size = (self.view_tile_size, self.view_tile_size)
         try:
             # Load grass tile
-            grass_tile = pygame.image.load("assets/images/tiles/Grass_Middle.png").convert_alpha()
-            grass_tile = pygame.transform.scale(grass_tile, (self.tile_size, self.tile_size))
+            grass_tile = asset_cache.frame("assets/images/tiles/Grass_Middle.png", size=size)
 
             # Load farmland tile
-            farmland_tile = pygame.image.load("assets/images/tiles/FarmLand_Tile.png").convert_alpha()
-            farmland_tile = pygame.transform.scale(farmland_tile, (self.tile_size, self.tile_size))
+            farmland_tile = asset_cache.frame("assets/images/tiles/FarmLand_Tile.png", size=size)
 
             # Load water tile
-            water_tile = pygame.image.load("assets/images/tiles/Water_Middle.png").convert_alpha()
-            water_tile = pygame.transform.scale(water_tile, (self.tile_size, self.tile_size))
+            water_tile = asset_cache.frame("assets/images/tiles/Water_Middle.png", size=size)
 
             # Load path tile
-            path_tile = pygame.image.load("assets/images/tiles/Path_Middle.png").convert_alpha()
-            path_tile = pygame.transform.scale(path_tile, (self.tile_size, self.tile_size))
+            path_tile = asset_cache.frame("assets/images/tiles/Path_Middle.png", size=size)
 
             # Load beach tile
-            beach_tile = pygame.image.load("assets/images/tiles/Beach_Tile.png").convert_alpha()
-            beach_tile = pygame.transform.scale(beach_tile, (self.tile_size, self.tile_size))
+            beach_tile = asset_cache.frame("assets/images/tiles/Beach_Tile.png", size=size)
 
             # Load cliff tile
-            cliff_tile = pygame.image.load("assets/images/tiles/Cliff_Tile.png").convert_alpha()
-            cliff_tile = pygame.transform.scale(cliff_tile, (self.tile_size, self.tile_size))
+            cliff_tile = asset_cache.frame("assets/images/tiles/Cliff_Tile.png", size=size)
 
             # Load house
-            self.house_image = pygame.image.load("assets/images/buildings/House.png").convert_alpha()
             # Scale house if needed (adjust size as appropriate)
-            house_width = 128  # Adjust based on your house image
-            house_height = 128  # Adjust based on your house image
-            self.house_image = pygame.transform.scale(self.house_image, (house_width, house_height))
+            house_width = 128 // self.pixel_scale  # Adjust based on your house image
+            house_height = 128 // self.pixel_scale  # Adjust based on your house image
+            self.house_image = asset_cache.frame("assets/images/buildings/House.png", size=(house_width, house_height))
 
             # Create placeholder for stone
-            stone_tile = pygame.Surface((self.tile_size, self.tile_size))
+            stone_tile = pygame.Surface(size)
             stone_tile.fill((169, 169, 169))  # Gray for stone
 
             # Store tiles in list
@@ -171,17 +246,17 @@ class World:
 
             print("Tiles carregados com sucesso!")
 
-        except pygame.error as e:
+        except (pygame.error, FileNotFoundError) as e:
             print(f"Erro ao carregar tiles: {e}")
             # Fallback to colored rectangles if images can't be loaded
             self.tile_sprites = [
-                pygame.Surface((self.tile_size, self.tile_size)),  # Grass
-                pygame.Surface((self.tile_size, self.tile_size)),  # Farmland
-                pygame.Surface((self.tile_size, self.tile_size)),  # Water
-                pygame.Surface((self.tile_size, self.tile_size)),  # Stone
-                pygame.Surface((self.tile_size, self.tile_size)),  # Path
-                pygame.Surface((self.tile_size, self.tile_size)),  # Beach
-                pygame.Surface((self.tile_size, self.tile_size))  # Cliff
+                pygame.Surface(size),  # Grass
+                pygame.Surface(size),  # Farmland
+                pygame.Surface(size),  # Water
+                pygame.Surface(size),  # Stone
+                pygame.Surface(size),  # Path
+                pygame.Surface(size),  # Beach
+                pygame.Surface(size)  # Cliff
             ]
 
             # Color the placeholders for each tile type
@@ -194,16 +269,19 @@ class World:
             self.tile_sprites[6].fill((105, 105, 105))  # Cliff (dim gray)
 
             # Create a placeholder for the house
-            self.house_image = pygame.Surface((128, 128))
+            self.house_image = pygame.Surface((128 // self.pixel_scale, 128 // self.pixel_scale))
             self.house_image.fill((165, 42, 42))  # Brown for house
 
     def load_background(self):
-        print("Creating background from grass tiles")
+        print("Creating chunk background from grass tiles")
 
+        # Every chunk surface starts from this grass background (in view pixels)
+        chunk_size = self.chunk_pixels // self.pixel_scale
+        size = (chunk_size, chunk_size)
         try:
             # Try to load the background image if it exists
             self.background_image = pygame.image.load("assets/images/tiles/world_background.png").convert()
-            self.background_image = pygame.transform.scale(self.background_image, (self.width, self.height))
+            self.background_image = pygame.transform.scale(self.background_image, size)
         except (pygame.error, FileNotFoundError) as e:
             print(f"Background image not found, creating from grass tiles: {e}")
 
@@ -213,55 +291,223 @@ class World:
                 grass_tile = self.tile_sprites[0]
 
                 # Create a surface for the background
-                self.background_image = pygame.Surface((self.width, self.height))
+                self.background_image = pygame.Surface(size)
 
                 # Tile the grass across the background
-                for x in range(0, self.width, self.tile_size):
-                    for y in range(0, self.height, self.tile_size):
+                for x in range(0, chunk_size, self.view_tile_size):
+                    for y in range(0, chunk_size, self.view_tile_size):
                         self.background_image.blit(grass_tile, (x, y))
             else:
                 # Fallback to a colored background if tiles aren't loaded
-                self.background_image = pygame.Surface((self.width, self.height))
+                self.background_image = pygame.Surface(size)
                 self.background_image.fill((34, 139, 34))  # Forest green
 
-    def get_tile_at(self, x, y):
-        grid_x = x // self.tile_size
-        grid_y = y // self.tile_size
+    def in_bounds(self, grid_x, grid_y):
+        return 0 <= grid_x < self.grid_width and 0 <= grid_y < self.grid_height
 
-        if 0 <= grid_x < self.grid_width and 0 <= grid_y < self.grid_height:
-            return self.grid[grid_x][grid_y]
+    def get_tile(self, grid_x, grid_y):
+        # Grid coordinates derived from float positions index the chunk arrays as ints
+        grid_x, grid_y = int(grid_x), int(grid_y)
+        if self.in_bounds(grid_x, grid_y):
+            return self.chunks.get_tile(grid_x, grid_y)
         return 0  # Default to grass
 
-    def set_tile_at(self, x, y, tile_type):
-        grid_x = x // self.tile_size
-        grid_y = y // self.tile_size
-
-        if 0 <= grid_x < self.grid_width and 0 <= grid_y < self.grid_height:
-            self.grid[grid_x][grid_y] = tile_type
-
-    def update(self):
-        # Update animal and plant managers
-        self.animal_manager.update()
-        self.plant_manager.update()
-
-    def render(self, screen):
-        # Render background
-        screen.blit(self.background_image, (0, 0))
+    def get_tile_at(self, x, y):
+        return self.get_tile(x // self.tile_size, y // self.tile_size)
 
-        # Render tiles that are different from grass (since grass is already in background)
-        for x in range(self.grid_width):
-            for y in range(self.grid_height):
-                tile_type = self.grid[x][y]
-                if tile_type != 0:  # Skip grass tiles (0) as they're in the background
-                    screen.blit(self.tile_sprites[tile_type],
-                                (x * self.tile_size, y * self.tile_size))
+    def set_tile_at(self, x, y, tile_type):
+        self.set_tile(x // self.tile_size, y // self.tile_size, tile_type)
+
+    def set_tile(self, grid_x, grid_y, tile_type):
+        # Change a tile by grid coordinates; its chunk re-blits only that cell
+        grid_x, grid_y = int(grid_x), int(grid_y)
+        if self.in_bounds(grid_x, grid_y):
+            self.chunks.set_tile(grid_x, grid_y, tile_type)
+
+    def get_viewport(self):
+        # Area of the world shown on screen
+        return self.camera.get_viewport()
+
+    def visible_chunk_range(self):
+        viewport = self.get_viewport().clip(pygame.Rect(0, 0, self.width, self.height))
+        if viewport.width == 0 or viewport.height == 0:
+            return None
+        return (viewport.left // self.chunk_pixels, viewport.top // self.chunk_pixels,
+                (viewport.right - 1) // self.chunk_pixels, (viewport.bottom - 1) // self.chunk_pixels)
+
+    def visible_chunks(self):
+        chunk_range = self.visible_chunk_range()
+        if chunk_range is None:
+            return []
+        min_cx, min_cy, max_cx, max_cy = chunk_range
+        return [self.chunks.get_chunk(cx, cy)
+                for cy in range(min_cy, max_cy + 1)
+                for cx in range(min_cx, max_cx + 1)]
+
+    def stream_chunks(self):
+        # Load chunks around the view and evict far away ones; memory stays flat
+        # no matter how much of the world has been explored
+        chunk_range = self.visible_chunk_range()
+        if chunk_range is None:
+            return
+
+        self.chunks.stream(*chunk_range, margin=CHUNK_LOAD_MARGIN)
+
+        # Only chunks on screen keep a baked surface
+        visible = set((chunk.cx, chunk.cy) for chunk in self.visible_chunks())
+        for key, chunk in self.chunks.chunks.items():
+            if key not in visible:
+                chunk.surface = None
+                chunk.dirty_tiles.clear()
+
+    def bake_chunk(self, chunk):
+        # Composite the grass background and non-grass tiles of a chunk
+        chunk.surface = self.background_image.copy()
+
+        # Skip grass tiles (0) as they're in the background
+        ys, xs = np.nonzero(chunk.tiles)
+        tile_sprites = self.tile_sprites
+        tile_size = self.view_tile_size
+        blit_all(chunk.surface, [(tile_sprites[tile_type], (x * tile_size, y * tile_size))
+                                 for tile_type, x, y in zip(chunk.tiles[ys, xs].tolist(), xs.tolist(), ys.tolist())])
+        chunk.dirty_tiles.clear()
+
+    def redraw_dirty_tiles(self, chunk):
+        tile_size = self.view_tile_size
+        for x, y in chunk.dirty_tiles:
+            cell = pygame.Rect(x * tile_size, y * tile_size, tile_size, tile_size)
+
+            # Restore the background under the cell, then draw the new tile
+            chunk.surface.blit(self.background_image, cell, cell)
+            tile_type = chunk.get(x, y)
+            if tile_type != 0:
+                chunk.surface.blit(self.tile_sprites[tile_type], cell)
+
+        chunk.dirty_tiles.clear()
+
+    def chunk_screen_pos(self, chunk):
+        # In view pixels; the camera offset is a whole number of them
+        viewport = self.get_viewport()
+        scale = self.camera.pixel_scale
+        return (chunk.cx * self.chunk_pixels - viewport.x) // scale, (chunk.cy * self.chunk_pixels - viewport.y) // scale
+
+    def update_terrain_layer(self):
+        """Bring the visible chunk surfaces up to date and return the screen rects that changed.
+
+        Returns None when a visible chunk had to be baked from scratch.
+        """
+        self.stream_chunks()
+
+        changed = []
+        rebuilt = False
+        tile_size = self.view_tile_size
+        for chunk in self.visible_chunks():
+            if chunk.surface is None:
+                self.bake_chunk(chunk)
+                rebuilt = True
+            elif chunk.dirty_tiles:
+                chunk_x, chunk_y = self.chunk_screen_pos(chunk)
+                for x, y in chunk.dirty_tiles:
+                    changed.append(pygame.Rect(chunk_x + x * tile_size, chunk_y + y * tile_size, tile_size, tile_size))
+                self.redraw_dirty_tiles(chunk)
+
+        return None if rebuilt else changed
+
+    def restore_terrain(self, screen, rect):
+        # Repaint the terrain and house under a screen rect (used by dirty-rect rendering)
+        for chunk in self.visible_chunks():
+            chunk_rect = pygame.Rect(self.chunk_screen_pos(chunk), chunk.surface.get_size())
+            area = rect.clip(chunk_rect)
+            if area.width and area.height:
+                screen.blit(chunk.surface, area, area.move(-chunk_rect.x, -chunk_rect.y))
+
+        house_rect = self.house_image.get_rect(topleft=self.house_screen_pos())
+        area = rect.clip(house_rect)
+        if area.width and area.height:
+            screen.blit(self.house_image, area, area.move(-house_rect.x, -house_rect.y))
+
+    def house_screen_pos(self):
+        offset_x, offset_y = self.camera.offset()
+        scale = self.camera.pixel_scale
+        return (self.house_pos[0] - offset_x) // scale, (self.house_pos[1] - offset_y) // scale
+
+    def get_drawables(self):
+        """Entities overlapping the viewport, back to front.
+
+        Plants and trees come from the plant manager's spatial indexes and
+        animals from a bounds check, so the cost follows what is on screen
+        rather than the size of the farm.
+        """
+        viewport = self.get_viewport()
+        visible = self.plant_manager.plants_in_rect(viewport)
+        visible += self.plant_manager.trees_in_rect(viewport)
+        visible += self.animal_manager.animals_in_rect(viewport)
+
+        player = self.game.player
+        if player in self.render_queue and viewport.colliderect(player.get_rect()):
+            visible.append(player)
+
+        return self.render_queue.sort(visible)
+
+    def render_terrain(self, screen):
+        # Bake chunks as they come into view, then only re-blit tiles that changed
+        self.update_terrain_layer()
+
+        # One blit per visible chunk, independent of the world size
+        draw_list = self.draw_list
+        draw_list.clear()
+        for chunk in self.visible_chunks():
+            draw_list.append((chunk.surface, self.chunk_screen_pos(chunk)))
 
         # Render house (draw after tiles but before plants and animals for proper layering)
-        screen.blit(self.house_image, self.house_pos)
+        draw_list.append((self.house_image, self.house_screen_pos()))
 
-        # Render plants and trees
-        self.plant_manager.render(screen)
+        blit_all(screen, draw_list)
+        self.terrain_blits = len(draw_list)
+        draw_list.clear()
 
-        # Render animals
-        self.animal_manager.render(screen)
+    def update(self, dt):
+        # Update animal and plant managers
+        self.animal_manager.update(dt)
+        self.plant_manager.update(dt)
+
+    def render_entities(self, screen):
+        # Plants, trees, animals and the player in view, back to front, in one blits call;
+        # their frames are already at the view's pixel scale, so they only place them
+        offset = self.camera.offset()
+        scale = self.pixel_scale
+        draw_list = self.draw_list
+        draw_list.clear()
+        for obj in self.get_drawables():
+            obj.add_blits(draw_list, offset, scale)
+
+        blit_all(screen, draw_list)
+        self.entity_blits = len(draw_list)
+        draw_list.clear()
+
+    def view_target(self, screen):
+        # At zoom 1 the world is drawn straight to the screen; zoomed or at native
+        # resolution it goes into the camera's view surface, scaled to the screen in one go
+        camera = self.camera
+        return screen if camera.zoom == 1 and camera.pixel_scale == 1 else camera.view_surface()
+
+    def present_view(self, target, output):
+        # Scale the composed view (or the screen) into the output surface in one step
+        if target is not output:
+            pygame.transform.scale(target, output.get_size(), output)
+
+    def render(self, screen, output=None):
+        """Draw the world for screen; the finished frame ends up in output (the screen by default).
+
+        Given the window as output, the view is scaled straight into it.
+        """
+        target = self.view_target(screen)
+
+        # Render terrain
+        self.render_terrain(target)
+
+        # Render entities
+        self.render_entities(target)
+
+        self.present_view(target, screen if output is None else output)
 
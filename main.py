@@ -1,7 +1,21 @@
 # This is the main entry point for the game
+import argparse
 from code.game import Game
 
 if __name__ == "__main__":
-    game = Game()
-    game.run()
+    parser = argparse.ArgumentParser(description="Pixel Farm")
+    parser.add_argument("--headless", action="store_true",
+                        help="simulate without a window, as fast as possible")
+    parser.add_argument("--ticks", type=int, help="number of ticks to simulate in headless mode")
+    parser.add_argument("--seconds", type=float, help="game time to simulate in headless mode, in seconds")
+    args = parser.parse_args()
 
+    if args.headless:
+        game = Game(headless=True)
+        ticks = args.ticks
+        if args.seconds is not None:
+            ticks = int(round(args.seconds * game.tick_rate))
+        game.run_headless(ticks)
+    else:
+        game = Game()
+        game.run()